@@ -2,6 +2,7 @@
 from .quadruple import Quadruple
 from .activation_record_design import ActivationRecordDesign
 from .memory_manager import MemoryManager
+from .types import INT_TYPE, STRING_TYPE, BOOL_TYPE
 
 class CodeGenerator:
     def __init__(self, symbol_table):
@@ -455,14 +456,12 @@ class CodeGenerator:
             value_type: Tipo del valor (INT_TYPE, STRING_TYPE, BOOL_TYPE)
             ctx: Contexto del parser (opcional)
         """
-        from classes.types import INT_TYPE, STRING_TYPE, BOOL_TYPE
-
         # Determinar el tipo de print basado en el tipo del valor
-        if value_type == INT_TYPE:
+        if value_type is INT_TYPE:
             self.emit_quad('print_int', value_temp, None, None, comment="Print integer")
-        elif value_type == BOOL_TYPE:
+        elif value_type is BOOL_TYPE:
             self.emit_quad('print_int', value_temp, None, None, comment="Print boolean as integer")
-        elif value_type == STRING_TYPE:
+        elif value_type is STRING_TYPE:
             self.emit_quad('print_str', value_temp, None, None, comment="Print string")
         else:
             # Fallback: print como integer
@@ -1280,8 +1279,7 @@ class CodeGenerator:
             
             # Case body
             self.emit_quad('label', None, None, case_label)
-            for stmt in case_ctx.statement():
-                self.current_visitor.visit(stmt)
+            self.current_visitor.visit(case_ctx)
             
             # Jump to end (no fallthrough)
             self.emit_quad('goto', None, None, end_label)
@@ -1293,8 +1291,7 @@ class CodeGenerator:
         if default_case:
             default_label = self.new_label()
             self.emit_quad('label', None, None, default_label)
-            for stmt in default_case.statement():
-                self.current_visitor.visit(stmt)
+            self.current_visitor.visit(default_case)
         
         # End label
         self.emit_quad('label', None, None, end_label)
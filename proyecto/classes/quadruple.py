@@ -2,6 +2,8 @@
 # para la generacion de codigo intermedio
 
 class Quadruple:
+    __slots__ = ('op', 'arg1', 'arg2', 'result', 'comment')
+
     def __init__(self, op, arg1, arg2, result, comment=None):
         self.op = op
         self.arg1 = arg1
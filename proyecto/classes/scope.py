@@ -1,4 +1,6 @@
 class Scope:
+    __slots__ = ('symbols', 'scope_id', 'scope_type', 'parent')
+
     def __init__(self, scope_id, scope_type="block", parent=None):
         self.symbols = {}
         self.scope_id = scope_id
@@ -6,10 +8,18 @@ class Scope:
         self.parent = parent # referencia al padre
         
     def add(self, symbol):
-        if symbol.name in self.symbols:
-            raise Exception(f"Symbol '{symbol.name}' ya existe en el scope")
+        err = self.try_add(symbol)
+        if err:
+            raise Exception(err)
+
+    def try_add(self, symbol):
+        # Devuelve el mensaje de error en vez de lanzar; None si se agregó
+        name = symbol.name
+        if name in self.symbols:
+            return f"Symbol '{name}' ya existe en el scope"
         symbol.scope_id = self.scope_id  # Usar scope_id 
-        self.symbols[symbol.name] = symbol
+        self.symbols[name] = symbol
+        return None
         
     def lookup(self, name):
         return self.symbols.get(name)
\ No newline at end of file
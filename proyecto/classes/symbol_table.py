@@ -7,6 +7,9 @@ class SymbolTable:
         self.scopes = []  # Pila de ámbitos activos
         self.all_scopes = []  # Todos los ámbitos creados
         self.next_scope_id = 0  # Contador para IDs únicos
+        self.current_scope_id = 0  # ID del ámbito en el tope de la pila
+        self.current_scope_type = "global"  # Tipo del ámbito en el tope de la pila
+        self._lookup_cache = {}  # nombre -> símbolo visible desde la pila actual
         self._init_global_scope()
         
     def _init_global_scope(self):
@@ -15,6 +18,9 @@ class SymbolTable:
         self.scopes = [global_scope]
         self.all_scopes = [global_scope]
         self.next_scope_id = 1  # El próximo ID será 1
+        self.current_scope_id = 0
+        self.current_scope_type = "global"
+        self._lookup_cache = {}
         
     def enter_scope(self, scope_type="block"):
         parent = self.scopes[-1] if self.scopes else None
@@ -23,51 +29,67 @@ class SymbolTable:
         
         self.scopes.append(new_scope)
         self.all_scopes.append(new_scope)
+        self.current_scope_id = new_scope.scope_id
+        self.current_scope_type = scope_type
         
     def exit_scope(self):
         """Sale del ámbito actual (excepto global)"""
         if len(self.scopes) > 1:  # No salir del ámbito global
             discarded = self.scopes.pop()
+            top = self.scopes[-1]
+            self.current_scope_id = top.scope_id
+            self.current_scope_type = top.scope_type
+            # Lo resuelto en el ámbito descartado ya no es visible
+            if discarded.symbols:
+                self._lookup_cache.clear()
             return discarded
         return None
         
     def add_symbol(self, symbol):
+        # El nuevo símbolo puede ocultar al que estaba en caché con ese nombre
+        self._lookup_cache.pop(symbol.name, None)
         self.scopes[-1].add(symbol)
+
+    def try_add_symbol(self, symbol):
+        """Como add_symbol, pero devuelve el mensaje de error (o None) sin lanzar"""
+        self._lookup_cache.pop(symbol.name, None)
+        return self.scopes[-1].try_add(symbol)
         
     # symbol_table.py
     def lookup(self, name, current_scope_only=False):
         """Busca un símbolo, opcionalmente solo en el ámbito actual"""
         # Buscar primero en el ámbito actual
         if current_scope_only:
-            return self.scopes[-1].lookup(name)
+            return self.scopes[-1].symbols.get(name)
         
+        # Entrar a un ámbito nuevo (vacío) no cambia lo ya resuelto; add_symbol y
+        # exit_scope invalidan la caché cuando sí puede cambiar
+        sym = self._lookup_cache.get(name)
+        if sym is not None:
+            return sym
+
         # Buscar en todos los ámbitos activos (desde el más interno hacia afuera)
+        # con un solo get por ámbito (nunca se guardan símbolos None)
         for scope in reversed(self.scopes):
-            symbol = scope.lookup(name)
-            if symbol is not None:
-                return symbol
+            sym = scope.symbols.get(name)
+            if sym is not None:
+                self._lookup_cache[name] = sym
+                return sym
         return None
         
     def lookup_in_class(self, class_name, member_name):
         """Busca un miembro específico en una clase"""
         class_symbol = self.lookup(class_name)
-        if not class_symbol or not isinstance(class_symbol, ClassSymbol):
+        if not isinstance(class_symbol, ClassSymbol):
             return None
             
-        # Busca en jerarquía de herencia
-        current = class_symbol
-        while current:
-            if member_name in current.attributes:
-                return current.attributes[member_name]
-            if member_name in current.methods:
-                return current.methods[member_name]
-            current = current.parent_class
-        return None
+        # La jerarquía de herencia ya está aplanada en class_symbol.members
+        return class_symbol.members.get(member_name)
     
     #Verifica si un símbolo está declarado específicamente en el ámbito actual
     def is_declared_in_current_scope(self, name):
-        return self.scopes[-1].lookup(name) is not None
+        return name in self.scopes[-1].symbols
     
     def lookup_in_current_scope(self, name):
         """Busca un símbolo únicamente en el ámbito actual"""
-        return self.scopes[-1].lookup(name)
\ No newline at end of file
+        return self.scopes[-1].symbols.get(name)
\ No newline at end of file
@@ -1,6 +1,8 @@
 from .types import Type
 
 class Symbol:
+    __slots__ = ('name', 'type', 'category', 'scope_id', 'line_number')
+
     def __init__(self, name, type_, category, scope_id):
         self.name = name
         self.type = type_      # Objeto Type
@@ -13,6 +15,8 @@ class Symbol:
         return f"{self.category.capitalize()} {self.name}: {type_name}, scope: {self.scope_id}"
 
 class VariableSymbol(Symbol):
+    __slots__ = ('is_const', 'initialized', 'offset', 'is_nullable', 'is_type_inferred')
+
     def __init__(self, name, type_, scope_id, is_const=False, is_type_inferred=False):
         super().__init__(name, type_, "variable", scope_id)
         self.is_const = is_const
@@ -28,12 +32,15 @@ class VariableSymbol(Symbol):
         return f"Var: {self.name}{const_str}{inferred_str} | {type_str} | Scope: {self.scope_id}"
 
 class FunctionSymbol(Symbol):
+    __slots__ = ('return_type', 'parameters', 'locals', 'has_return', 'bad_returns')
+
     def __init__(self, name, return_type, scope_id, params=None):
         super().__init__(name, return_type, "function", scope_id)
         self.return_type = return_type
         self.parameters = params or []
         self.locals = []
-        self.return_statements = []
+        self.has_return = False  # Basta saber si hubo algún return; los tipos malos van aparte
+        self.bad_returns = []  # Solo los tipos de return que no coinciden (sin ERROR_TYPE)
         
     def __str__(self):
         params_str = ", ".join([f"{p.name}: {p.type.name}" for p in self.parameters])
@@ -49,11 +56,17 @@ class FunctionSymbol(Symbol):
         self.locals.append(local)
 
 class ClassSymbol(Symbol):
+    __slots__ = ('parent_class', 'attributes', 'methods', 'members', 'constructor')
+
     def __init__(self, name, scope_id, parent_class=None):
         super().__init__(name, None, "class", scope_id)
         self.parent_class = parent_class
         self.attributes = {}
         self.methods = {}
+        # Miembros visibles (propios + heredados) en un solo diccionario,
+        # parte de los de la clase padre que ya está completamente declarada
+        self.members = dict(parent_class.members) if parent_class else {}
+        self.constructor = None  # Constructor propio (no se hereda), para resolver `new` sin buscar
         
     def __str__(self):
         
@@ -70,6 +83,12 @@ class ClassSymbol(Symbol):
         
     def add_attribute(self, attr):
         self.attributes[attr.name] = attr
+        self.members[attr.name] = attr
         
     def add_method(self, method):
-        self.methods[method.name] = method
\ No newline at end of file
+        self.methods[method.name] = method
+        if method.name == "constructor":
+            self.constructor = method
+        # Un atributo propio con el mismo nombre tiene prioridad sobre el método
+        if method.name not in self.attributes:
+            self.members[method.name] = method
\ No newline at end of file
@@ -1,6 +1,8 @@
-from functools import reduce
+from math import prod
 
 class Type:
+    __slots__ = ('name', 'parent', 'width', 'methods')
+
     def __init__(self, name, parent=None):
         self.name = name
         self.parent = parent  
@@ -8,11 +10,19 @@ class Type:
         self.methods = {}    # 
         
     def __eq__(self, other):
-        return isinstance(other, Type) and self.name == other.name
+        # Los tipos básicos son singletons: la identidad resuelve el caso común
+        return self is other or (isinstance(other, Type) and self.name == other.name)
+    
+    def __hash__(self):
+        return hash(self.name)
     
     # Verifica compatibilidad de tipos en asignaciones
     def can_assign_to(self, other_type):
-        if self == NULL_TYPE:
+        # Caso común (argumento del mismo tipo primitivo que el parámetro): sin llamar a __eq__
+        if self is other_type:
+            return True
+
+        if self is NULL_TYPE:
             # null puede asignarse a cualquier tipo excepto primitivos no-nullables
             return other_type not in (INT_TYPE, BOOL_TYPE, VOID_TYPE)
         
@@ -21,27 +31,34 @@ class Type:
             return True
         
         # Caso especial: boolean puede compararse con expresiones condicionales
-        if other_type == BOOL_TYPE and isinstance(self, (PrimitiveType, ArrayType)):
+        if other_type is BOOL_TYPE and isinstance(self, (PrimitiveType, ArrayType)):
             return True
         
         return False
 
 class PrimitiveType(Type):
+    __slots__ = ()
+
     def __init__(self, name, width):
         super().__init__(name)
         self.width = width
 
+# Sin subclases: el visitor la reconoce con `type(t) is ArrayType`
 class ArrayType(Type):
+    __slots__ = ('element_type', 'dimensions')
+
     def __init__(self, element_type, dimensions):
         super().__init__(f"array<{element_type.name}>")
         self.element_type = element_type
         self.dimensions = dimensions
-        self.width = element_type.width * reduce(lambda x, y: x*y, dimensions, 1)
+        self.width = element_type.width * prod(dimensions)
 class ErrorType(Type):
+    __slots__ = ()
+
     def __init__(self):
         super().__init__("error")
 
-# Tipos básicos
+# Tipos básicos (instancias únicas, se pueden comparar con `is`)
 INT_TYPE = PrimitiveType("integer", 4)
 BOOL_TYPE = PrimitiveType("boolean", 1)
 STRING_TYPE = PrimitiveType("string", 8)
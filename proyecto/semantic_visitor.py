@@ -1,3 +1,5 @@
+from contextlib import contextmanager
+from functools import partial
 from antlr4 import *
 from classes.types import *
 from classes.symbols import *
@@ -6,108 +8,167 @@ from classes.code_generator import CodeGenerator
 from CompiscriptVisitor import CompiscriptVisitor
 from CompiscriptParser import CompiscriptParser
 
+# Tablas de resultados para operadores binarios válidos.
+# Una sola consulta (operador, izquierdo, derecho) reemplaza la cascada de ifs;
+# si no hay entrada la operación es inválida y se reporta el error.
+_ADDITIVE_RESULTS = {
+    ('+', INT_TYPE, INT_TYPE): INT_TYPE,
+    ('+', STRING_TYPE, STRING_TYPE): STRING_TYPE,
+    # string + integer (y viceversa) inserta un toString() implícito en el codegen
+    ('+', STRING_TYPE, INT_TYPE): STRING_TYPE,
+    ('+', INT_TYPE, STRING_TYPE): STRING_TYPE,
+    ('-', INT_TYPE, INT_TYPE): INT_TYPE,
+}
+_ARITHMETIC_RESULTS = {(INT_TYPE, INT_TYPE): INT_TYPE}      # * / %
+_LOGICAL_RESULTS = {(BOOL_TYPE, BOOL_TYPE): BOOL_TYPE}      # && ||
+_RELATIONAL_RESULTS = {(INT_TYPE, INT_TYPE): BOOL_TYPE}     # < <= > >=
+
+_LITERAL_TOKEN = CompiscriptParser.Literal
+
+_BOOL_LITERAL_TOKENS = frozenset((CompiscriptParser.TRUE, CompiscriptParser.FALSE))
+
+# Plantilla compartida por if/while/do-while/for; add_error la formatea al reportar
+_CONDITION_NOT_BOOL = "Condición de '%s' debe ser boolean, encontrado %s"
+
+# Tipos que aceptan print() y switch
+_PRINTABLE_TYPES = frozenset((INT_TYPE, STRING_TYPE, BOOL_TYPE))
+_SWITCH_TYPES = frozenset((INT_TYPE, BOOL_TYPE))
+
+# Ámbitos que ya abrieron el suyo; su bloque de cuerpo no crea otro
+_NO_NEW_SCOPE = frozenset(('function', 'class'))
+
+# Literales de palabra clave: tipo de token -> tipo semántico (el texto es el inmediato)
+_KEYWORD_LITERAL_TYPES = {
+    CompiscriptParser.NULL: NULL_TYPE,
+    CompiscriptParser.TRUE: BOOL_TYPE,
+    CompiscriptParser.FALSE: BOOL_TYPE,
+}
+
+# Miembros de clase: el tipo del contexto hijo decide si es atributo o método
+# (los atributos se despachan con _ATTRIBUTE_VISITORS, al final del módulo)
+_METHOD_MEMBER_CONTEXT = CompiscriptParser.FunctionDeclarationContext
+
+class _ArrayLiteralValues(list):
+    """Temporales de los elementos de un array literal, dejados en current_temp"""
+    __slots__ = ()
+
+def _line_of(ctx):
+    """Línea de un ParserRuleContext o TerminalNode para los diagnósticos"""
+    if isinstance(ctx, ParserRuleContext):
+        return ctx.start.line
+    if isinstance(ctx, TerminalNode):
+        return ctx.symbol.line
+    return "unknown"
+
 class SemanticVisitor(CompiscriptVisitor):
+    __slots__ = ('symbol_table', 'errors', 'current_function', 'current_class',
+                 'loop_depth', 'warnings', 'unreachable_code',
+                 'codegen', 'current_temp', '_type_cache', '_class_types',
+                 '_gen_arith', '_gen_logical', '_gen_cmp')
+
     def __init__(self):
         self.symbol_table = SymbolTable()
         self.errors = []
         self.current_function = None
         self.current_class = None
-        self.in_loop = False
-        self.loop_depth = 0
+        self.loop_depth = 0  # > 0 dentro de un bucle (break/continue válidos)
         self.warnings = []  # Para advertencias de código muerto
         self.unreachable_code = False  # Flag para detectar código muerto
         self.codegen = CodeGenerator(self.symbol_table)
         self.codegen.current_visitor = self  # Allow code generator to call visitor methods
+        # Generadores usados por cada operador binario, ligados una sola vez
+        self._gen_arith = self.codegen.generate_arithmetic_operation
+        self._gen_logical = self.codegen.generate_logical_operation
+        self._gen_cmp = self.codegen.generate_comparison
         self.current_temp = None
+        self._type_cache = {}  # texto de anotación primitiva/array -> Type ya resuelto
+        self._class_types = {}  # nombre -> Type de instancia (solo depende del nombre)
         
     # Helper methods
-    def add_error(self, ctx, message):
-        # Manejar tanto ParserRuleContext como TerminalNode
-        if hasattr(ctx, 'start'):
-            line = ctx.start.line
-        elif hasattr(ctx, 'symbol'):
-            line = ctx.symbol.line
-        else:
-            line = "unknown"
-        
-        self.errors.append(f"Error semántico. Línea {line}: {message}")
+    def add_error(self, ctx, message, *args):
+        # `message` puede ser una plantilla con %s: se formatea solo aquí, al reportar
+        if args:
+            message = message % args
+        self.errors.append(f"Error semántico. Línea {_line_of(ctx)}: {message}")
         #print(self.errors[-1])
     
-    def add_warning(self, ctx, message):
+    def add_warning(self, ctx, message, *args):
         # Agregar advertencias para código muerto u otros problemas no críticos
-        if hasattr(ctx, 'start'):
-            line = ctx.start.line
-        elif hasattr(ctx, 'symbol'):
-            line = ctx.symbol.line
-        else:
-            line = "unknown"
-        
-        self.warnings.append(f"Advertencia. Línea {line}: {message}")
+        if args:
+            message = message % args
+        self.warnings.append(f"Advertencia. Línea {_line_of(ctx)}: {message}")
     
     def check_unreachable_code(self, ctx, description="código"):
         """Verifica si el código es inalcanzable y agrega advertencia"""
         if self.unreachable_code:
-            self.add_warning(ctx, f"Código muerto: {description} nunca se ejecutará")
+            self.add_warning(ctx, "Código muerto: %s nunca se ejecutará", description)
             return True
         return False
     
-    def validate_semantic_expression(self, ctx, expr_type, operation, operands=None):
-        """Valida que una expresión tenga sentido semántico"""
-        if expr_type == ERROR_TYPE:
-            return False
-            
-        # Validar operaciones aritméticas sin sentido
-        if operation in ['add', 'subtract', 'multiply', 'divide', 'modulo']:
-            if expr_type not in [INT_TYPE, ERROR_TYPE]:
-                self.add_error(ctx, f"Operación aritmética '{operation}' con resultado no numérico ({expr_type.name})")
-                return False
-        
-        # Validar comparaciones sin sentido
-        if operation in ['compare']:
-            if operands and len(operands) == 2:
-                left, right = operands
-                if left != right and left != NULL_TYPE and right != NULL_TYPE:
-                    self.add_warning(ctx, f"Comparación entre tipos diferentes: {left.name} y {right.name}")
-        
-        # Validar asignaciones sin sentido
-        if operation == 'assignment':
-            if operands and len(operands) == 2:
-                target_type, value_type = operands
-                if value_type != ERROR_TYPE and not value_type.can_assign_to(target_type):
-                    return False
-        
-        return True
-    
+    def is_bool_literal(self, expr_ctx):
+        """True si la expresión es exactamente `true` o `false` (ya se sabe que es boolean)"""
+        first = expr_ctx.start
+        return first is expr_ctx.stop and first.type in _BOOL_LITERAL_TOKENS
+
     def check_division_by_zero(self, ctx, right_operand_ctx):
         """Verifica división por cero en tiempo de compilación si es posible"""
-        if hasattr(right_operand_ctx, 'Literal'):
-            literal = right_operand_ctx.Literal()
-            if literal and literal.getText() == '0':
-                self.add_warning(ctx, "Posible división por cero")
-                return True
+        # El operando debe ser exactamente un token Literal '0'
+        first = right_operand_ctx.start
+        if first is right_operand_ctx.stop and first.type == _LITERAL_TOKEN and first.text == '0':
+            self.add_warning(ctx, "Posible división por cero")
+            return True
         return False
         
     def get_type_from_ctx(self, type_ctx):
         if not type_ctx:
             return None
         type_str = type_ctx.getText()
-        t = get_type_from_string(type_str)
-        
+        # Las anotaciones se repiten mucho (integer, string, ...), reutilizar el tipo ya resuelto
+        t = self._type_cache.get(type_str)
         if t is not None:
             return t
-        # Si no es primitivo/array, puede ser una clase declarada
-        cls = self._lookup_class(type_str)
-        if cls:
+        t = get_type_from_string(type_str)
+        
+        if t is None:
+            # Si no es primitivo/array, puede ser una clase declarada. No se guarda en
+            # _type_cache: depende de los ámbitos visibles (sombra, clases locales)
+            cls = self._lookup_class(type_str)
+            if not cls:
+                return None
             return self._class_type(type_str)
-        return None
+        self._type_cache[type_str] = t
+        return t
     
+    # Despacho directo por tipo de contexto (ver _DISPATCH al final del módulo)
+    def visit(self, tree):
+        method = _DISPATCH.get(type(tree))
+        if method is not None:
+            return method(self, tree)
+        return tree.accept(self)
+
+    def visitChildren(self, node):
+        # Igual que ParseTreeVisitor.visitChildren: devuelve el resultado del último hijo.
+        # Los terminales no tienen efecto semántico, solo anulan el resultado.
+        result = None
+        children = node.children
+        if children:
+            for child in children:
+                if isinstance(child, ParserRuleContext):
+                    method = _DISPATCH.get(type(child))
+                    result = method(self, child) if method is not None else child.accept(self)
+                else:
+                    result = None
+        return result
+
     # Visit methods
     def visitProgram(self, ctx):
         return self.visitChildren(ctx)
     
     def visitStatement(self, ctx):
         # Verificar código muerto antes de procesar cualquier statement
-        self.check_unreachable_code(ctx, "statement")
+        # (en línea: es el camino más frecuente y casi siempre es alcanzable)
+        if self.unreachable_code:
+            self.add_warning(ctx, "Código muerto: statement nunca se ejecutará")
         return self.visitChildren(ctx)
     
     # ===============================================================================================
@@ -115,101 +176,80 @@ class SemanticVisitor(CompiscriptVisitor):
     #
     #
     # Esta función verifica operaciones aritméticas
-    def check_additive_operation(self, left_type, right_type, operator, ctx):
+    def check_additive_operation(self, left_type: Type, right_type: Type, operator, ctx) -> Type:
         
         # Si alguno es None, lo convertimos a ERROR_TYPE
         if left_type is None or right_type is None:
             return ERROR_TYPE
 
         # Si alguno ya es ERROR_TYPE, propagamos sin error adicional
-        if left_type == ERROR_TYPE or right_type == ERROR_TYPE:
+        if left_type is ERROR_TYPE or right_type is ERROR_TYPE:
             return ERROR_TYPE
 
         # Determinar el operador
         op = operator.getText() if hasattr(operator, 'getText') else operator
 
-        # Caso concatenación: operador + con strings
-        if op == '+':
-            # If both are strings, simple concatenation
-            if left_type == STRING_TYPE and right_type == STRING_TYPE:
-                result_type = STRING_TYPE
-                self.validate_semantic_expression(ctx, result_type, 'concatenation', [left_type, right_type])
-                return result_type
-
-            # If one is string and the other is integer, we need to insert toString()
-            # This handles implicit conversion for string concatenation
-            elif (left_type == STRING_TYPE and right_type == INT_TYPE):
-                # Right side needs toString conversion
-                # Generate call to toString(right_temp)
-                # NOTE: toString function must exist in the compiled program
-                result_type = STRING_TYPE
-                self.validate_semantic_expression(ctx, result_type, 'concatenation', [left_type, right_type])
-                return result_type
-
-            elif (left_type == INT_TYPE and right_type == STRING_TYPE):
-                # Left side needs toString conversion
-                result_type = STRING_TYPE
-                self.validate_semantic_expression(ctx, result_type, 'concatenation', [left_type, right_type])
-                return result_type
+        # Casos válidos: concatenación, suma y resta de enteros
+        result_type = _ADDITIVE_RESULTS.get((op, left_type, right_type))
+        if result_type is not None:
+            return result_type
 
-            # If both are integers, it's arithmetic addition
-            elif left_type == INT_TYPE and right_type == INT_TYPE:
-                result_type = INT_TYPE
-                self.validate_semantic_expression(ctx, result_type, 'add')
-                return result_type
-            else:
-                left_name = left_type.name
-                right_name = right_type.name
-                self.add_error(ctx,
-                    f"Operación '+' no soportada para tipos {left_name} y {right_name}")
-                return ERROR_TYPE
+        if op == '+':
+            self.add_error(ctx, "Operación '+' no soportada para tipos %s y %s",
+                           left_type.name, right_type.name)
+            return ERROR_TYPE
 
-        # Caso resta aritmética (solo integers)
+        # Resta aritmética (solo integers)
         if op == '-':
-            if left_type == INT_TYPE and right_type == INT_TYPE:
-                result_type = INT_TYPE
-                self.validate_semantic_expression(ctx, result_type, 'subtract')
-                return result_type
-            else:
-                left_name = left_type.name
-                right_name = right_type.name
-                self.add_error(ctx,
-                    f"Operación '-' requiere operandos integer, got {left_name} y {right_name}")
-                return ERROR_TYPE
+            self.add_error(ctx, "Operación '-' requiere operandos integer, got %s y %s",
+                           left_type.name, right_type.name)
+            return ERROR_TYPE
 
         # Operador no reconocido
-        self.add_error(ctx, f"Operador no soportado: {op}")
+        self.add_error(ctx, "Operador no soportado: %s", op)
         return ERROR_TYPE
 
 
     # Visitor para additiveExpr (+ -)
     def visitAdditiveExpr(self, ctx):
-        children = list(ctx.getChildren())
-        if len(children) == 1:
-            return self.visit(ctx.multiplicativeExpr(0))
+        # Hijos alternan operando/operador: [expr, op, expr, op, expr, ...]
+        # Se indexan directamente en lugar de filtrar con ctx.multiplicativeExpr(i)
+        children = ctx.children
+        n = len(children)
+        if n == 1:
+            return self.visit(children[0])
+
+        codegen = self.codegen
+        visit = self.visit
 
         # Visitar primera expresión
-        left_type = self.visit(ctx.multiplicativeExpr(0))
-        left_temp = self.codegen.current_temp
+        left_type = visit(children[0])
+        left_temp = codegen.current_temp
         
         # fix: Marcar left_temp como usado en la expresión completa
-        self.codegen.mark_temp_used(left_temp)
+        codegen.mark_temp_used(left_temp)
         
-        for i in range(len(ctx.children) // 2):
-            operator = ctx.children[2*i + 1]
-            right_expr = ctx.multiplicativeExpr(i + 1)
+        for i in range(1, n - 1, 2):
+            operator = children[i]
+            right_expr = children[i + 1]
             
-            right_type = self.visit(right_expr)
-            right_temp = self.codegen.current_temp
+            right_type = visit(right_expr)
+
+            # Un operando izquierdo en error se propaga sin volver a verificar ni
+            # registrar temporales; el derecho igual se visitó para reportar sus propios errores
+            if left_type is ERROR_TYPE:
+                continue
+
+            right_temp = codegen.current_temp
             
             # NUEVO: Marcar right_temp como usado
-            self.codegen.mark_temp_used(right_temp)
+            codegen.mark_temp_used(right_temp)
             
             result_type = self.check_additive_operation(
                 left_type, right_type, operator, right_expr
             )
 
-            if result_type != ERROR_TYPE:
+            if result_type is not ERROR_TYPE:
                 op_text = operator.getText()
 
                 # Handle implicit toString() conversion for string concatenation
@@ -218,19 +258,19 @@ class SemanticVisitor(CompiscriptVisitor):
 
                 if op_text == '+':
                     # If left is int and right is string, convert left to string
-                    if left_type == INT_TYPE and right_type == STRING_TYPE:
+                    if left_type is INT_TYPE and right_type is STRING_TYPE:
                         # Generate call to toString(left_temp)
-                        actual_left = self.codegen.generate_toString_call(left_temp)
+                        actual_left = codegen.generate_toString_call(left_temp)
                     # If left is string and right is int, convert right to string
-                    elif left_type == STRING_TYPE and right_type == INT_TYPE:
+                    elif left_type is STRING_TYPE and right_type is INT_TYPE:
                         # Generate call to toString(right_temp)
-                        actual_right = self.codegen.generate_toString_call(right_temp)
+                        actual_right = codegen.generate_toString_call(right_temp)
 
-                result_temp = self.codegen.generate_arithmetic_operation(
+                result_temp = self._gen_arith(
                     actual_left, actual_right, op_text, ctx
                 )
                 left_temp = result_temp
-                self.codegen.current_temp = result_temp
+                codegen.current_temp = result_temp
 
             left_type = result_type
         
@@ -238,52 +278,54 @@ class SemanticVisitor(CompiscriptVisitor):
     
     def visitMultiplicativeExpr(self, ctx):
 
-        children = list(ctx.getChildren())
-        if len(children) == 1:
-            return self.visit(ctx.unaryExpr(0))
+        children = ctx.children
+        n = len(children)
+        if n == 1:
+            return self.visit(children[0])
+
+        codegen = self.codegen
+        visit = self.visit
 
         # Visitar la primera expresión
-        left_type = self.visit(ctx.unaryExpr(0))
-        left_temp = self.codegen.current_temp  # Guardar el temporal izquierdo
+        left_type = visit(children[0])
+        left_temp = codegen.current_temp  # Guardar el temporal izquierdo
         
         # Procesar cada operador y su expresión derecha
-        for i in range(len(ctx.children) // 2):
-            operator = ctx.children[2*i + 1]  # El operador está en posición impar
-            right_expr = ctx.unaryExpr(i + 1)
-            right_type = self.visit(right_expr)
-            right_temp = self.codegen.current_temp  # Guardar el temporal derecho
+        for i in range(1, n - 1, 2):
+            operator = children[i]  # El operador está en posición impar
+            right_expr = children[i + 1]
+            right_type = visit(right_expr)
+            right_temp = codegen.current_temp  # Guardar el temporal derecho
             
-            # Verificación semántica
-            result_type = self.check_arithmetic(left_type, right_type, right_expr)
+            # Verificación semántica (el error del lado izquierdo solo se propaga)
+            result_type = ERROR_TYPE if left_type is ERROR_TYPE else self.check_arithmetic(left_type, right_type, right_expr)
             
             # Generación de código
-            if result_type != ERROR_TYPE:
+            if result_type is not ERROR_TYPE:
                 op_text = operator.getText()
-                self.codegen.generate_arithmetic_operation(left_temp, right_temp, op_text, ctx)
-                left_temp = self.codegen.current_temp  # Actualizar para la siguiente operación
+                self._gen_arith(left_temp, right_temp, op_text, ctx)
+                left_temp = codegen.current_temp  # Actualizar para la siguiente operación
             
             left_type = result_type  # Actualizar el tipo para la siguiente operación
         
         return left_type
 
     # Mantenemos check_arithmetic solo para * / %
-    def check_arithmetic(self, left_type, right_type, ctx):
-        from classes.types import INT_TYPE, ERROR_TYPE
-
+    def check_arithmetic(self, left_type: Type, right_type: Type, ctx) -> Type:
         if left_type is None or right_type is None:
             return ERROR_TYPE
 
-        if left_type == ERROR_TYPE or right_type == ERROR_TYPE:
+        if left_type is ERROR_TYPE or right_type is ERROR_TYPE:
             return ERROR_TYPE
 
         # Verificar que ambos sean enteros
-        if left_type != INT_TYPE or right_type != INT_TYPE:
-            left_name = left_type.name
-            right_name = right_type.name
-            self.add_error(ctx, f"Operación aritmética requiere operandos integer, got {left_name} y {right_name}")
+        result_type = _ARITHMETIC_RESULTS.get((left_type, right_type))
+        if result_type is None:
+            self.add_error(ctx, "Operación aritmética requiere operandos integer, got %s y %s",
+                           left_type.name, right_type.name)
             return ERROR_TYPE
 
-        return INT_TYPE
+        return result_type
      # ===============================================================================================
     
     
@@ -291,25 +333,24 @@ class SemanticVisitor(CompiscriptVisitor):
     #
     #
     # Funciones de verificación para operaciones lógicas
-    def check_logical(self, left_type, right_type, ctx):
-        from classes.types import BOOL_TYPE, ERROR_TYPE
-        
-        if left_type == ERROR_TYPE or right_type == ERROR_TYPE:
+    def check_logical(self, left_type: Type, right_type: Type, ctx) -> Type:
+        if left_type is ERROR_TYPE or right_type is ERROR_TYPE:
             return ERROR_TYPE
         
-        if left_type != BOOL_TYPE or right_type != BOOL_TYPE:
-            left_name = left_type.name if left_type else "None"
-            right_name = right_type.name if right_type else "None"
-            self.add_error(ctx, f"Operación lógica requiere operandos boolean, got {left_name} y {right_name}")
+        result_type = _LOGICAL_RESULTS.get((left_type, right_type))
+        if result_type is None:
+            self.add_error(ctx, "Operación lógica requiere operandos boolean, got %s y %s",
+                           left_type.name if left_type else "None",
+                           right_type.name if right_type else "None")
             return ERROR_TYPE
         
-        return BOOL_TYPE
+        return result_type
     
     def visitPrimaryExpr(self, ctx):
-        if ctx.literalExpr():
-            return self.visit(ctx.literalExpr())
-        elif ctx.leftHandSide():
-            return self.visit(ctx.leftHandSide())
+        # Cada accessor recorre los hijos: se consulta una sola vez por alternativa
+        inner = ctx.literalExpr() or ctx.leftHandSide()
+        if inner is not None:
+            return self.visit(inner)
         elif ctx.LPAREN():
             return self.visit(ctx.expression())
         else:
@@ -317,97 +358,110 @@ class SemanticVisitor(CompiscriptVisitor):
             return ERROR_TYPE
 
     # Funciones de verificación para operaciones de comparación
-    def check_comparison(self, left_type, right_type, ctx):
+    def check_comparison(self, left_type: Type, right_type: Type, ctx) -> Type:
         
-        if left_type == ERROR_TYPE or right_type == ERROR_TYPE:
+        if left_type is ERROR_TYPE or right_type is ERROR_TYPE:
             return ERROR_TYPE
         
         # Caso especial: comparación con null
-        if left_type == NULL_TYPE or right_type == NULL_TYPE:
-            if (left_type == NULL_TYPE and right_type == NULL_TYPE):
+        if left_type is NULL_TYPE or right_type is NULL_TYPE:
+            if (left_type is NULL_TYPE and right_type is NULL_TYPE):
                 return BOOL_TYPE
-            if (left_type == NULL_TYPE and right_type not in (INT_TYPE, BOOL_TYPE)) or \
-            (right_type == NULL_TYPE and left_type not in (INT_TYPE, BOOL_TYPE)):
+            if (left_type is NULL_TYPE and right_type not in (INT_TYPE, BOOL_TYPE)) or \
+            (right_type is NULL_TYPE and left_type not in (INT_TYPE, BOOL_TYPE)):
                 return BOOL_TYPE
-            self.add_error(ctx.parentCtx, f"No se puede comparar null con {right_type.name if left_type == NULL_TYPE else left_type.name}")
+            self.add_error(ctx.parentCtx, "No se puede comparar null con %s",
+                           right_type.name if left_type is NULL_TYPE else left_type.name)
             return ERROR_TYPE
         
-        # Verificar compatibilidad de tipos
-        if left_type != right_type:
-            left_name = left_type.name if left_type else "None"
-            right_name = right_type.name if right_type else "None"
-            op = ctx.getText() if ctx else "=="
-            self.add_error(ctx.parentCtx, f"Operación de comparación '{op}' requiere tipos compatibles, got {left_name} y {right_name}")
+        # Verificar compatibilidad de tipos (mismo objeto: sin pasar por __eq__)
+        if left_type is not right_type and left_type != right_type:
+            self.add_error(ctx.parentCtx, "Operación de comparación '%s' requiere tipos compatibles, got %s y %s",
+                           ctx.getText() if ctx else "==",
+                           left_type.name if left_type else "None",
+                           right_type.name if right_type else "None")
             return ERROR_TYPE
         
         return BOOL_TYPE
 
-    def check_relational(self, left_type, right_type, ctx):
+    def check_relational(self, left_type: Type, right_type: Type, ctx) -> Type:
         
-        if left_type == ERROR_TYPE or right_type == ERROR_TYPE:
+        if left_type is ERROR_TYPE or right_type is ERROR_TYPE:
             return ERROR_TYPE
         
         # Verificar que ambos sean enteros
-        if left_type != INT_TYPE or right_type != INT_TYPE:
-            left_name = left_type.name if left_type else "None"
-            right_name = right_type.name if right_type else "None"
-            op = ctx.getText() if ctx else "rel_op"
-            self.add_error(ctx.parentCtx, f"Operación relacional '{op}' requiere operandos integer, got {left_name} y {right_name}")
+        result_type = _RELATIONAL_RESULTS.get((left_type, right_type))
+        if result_type is None:
+            self.add_error(ctx.parentCtx, "Operación relacional '%s' requiere operandos integer, got %s y %s",
+                           ctx.getText() if ctx else "rel_op",
+                           left_type.name if left_type else "None",
+                           right_type.name if right_type else "None")
             return ERROR_TYPE
         
-        return BOOL_TYPE
+        return result_type
     
     # Visitor para operaciones lógicas (&&, ||)
     def visitLogicalOrExpr(self, ctx):
-        if ctx.getChildCount() == 1:
-            return self.visit(ctx.logicalAndExpr(0))
+        # Hijos alternan operando/operador, igual que en visitAdditiveExpr
+        children = ctx.children
+        n = len(children)
+        if n == 1:
+            return self.visit(children[0])
+
+        codegen = self.codegen
+        visit = self.visit
         
         # Visitar la primera expresión y obtener su tipo y temporal
-        left_type = self.visit(ctx.logicalAndExpr(0))
-        left_temp = self.codegen.current_temp
+        left_type = visit(children[0])
+        left_temp = codegen.current_temp
         
         # Iterar por cada expresión adicional
-        for i in range(1, len(ctx.logicalAndExpr())):
-            right_expr = ctx.logicalAndExpr(i)
-            right_type = self.visit(right_expr)
-            right_temp = self.codegen.current_temp
+        for i in range(2, n, 2):
+            right_expr = children[i]
+            right_type = visit(right_expr)
+            right_temp = codegen.current_temp
             
-            # Verificación semántica
-            result_type = self.check_logical(left_type, right_type, right_expr)
+            # Verificación semántica (el error del lado izquierdo solo se propaga)
+            result_type = ERROR_TYPE if left_type is ERROR_TYPE else self.check_logical(left_type, right_type, right_expr)
             
             # Generación de código
-            if result_type != ERROR_TYPE:
-                op_text = '||' if isinstance(ctx, CompiscriptParser.LogicalOrExprContext) else '&&'
-                result_temp = self.codegen.generate_logical_operation(left_temp, right_temp, '||', ctx)
+            if result_type is not ERROR_TYPE:
+                result_temp = self._gen_logical(left_temp, right_temp, '||', ctx)
                 left_temp = result_temp
-                self.codegen.current_temp = result_temp
+                codegen.current_temp = result_temp
             
             left_type = result_type
         
         return left_type
 
     def visitLogicalAndExpr(self, ctx):
-        if ctx.getChildCount() == 1:
-            return self.visit(ctx.equalityExpr(0))
+        # Hijos alternan operando/operador, igual que en visitAdditiveExpr
+        children = ctx.children
+        n = len(children)
+        if n == 1:
+            return self.visit(children[0])
+
+        codegen = self.codegen
+        visit = self.visit
         
         # Visitar la primera expresión y obtener su tipo y temporal
-        left_type = self.visit(ctx.equalityExpr(0))
-        left_temp = self.codegen.current_temp
+        left_type = visit(children[0])
+        left_temp = codegen.current_temp
         
         # Iterar por cada expresión adicional
-        for i in range(1, len(ctx.equalityExpr())):
-            right_expr = ctx.equalityExpr(i)
-            right_type = self.visit(right_expr)
-            right_temp = self.codegen.current_temp
+        for i in range(2, n, 2):
+            right_expr = children[i]
+            right_type = visit(right_expr)
+            right_temp = codegen.current_temp
             
-            # Verificación semántica
-            result_type = self.check_logical(left_type, right_type, right_expr)
+            # Verificación semántica (el error del lado izquierdo solo se propaga)
+            result_type = ERROR_TYPE if left_type is ERROR_TYPE else self.check_logical(left_type, right_type, right_expr)
             
             # Generación de código
-            if result_type != ERROR_TYPE:
-                result_temp = self.codegen.generate_logical_operation(left_temp, right_temp, '&&', ctx)
+            if result_type is not ERROR_TYPE:
+                result_temp = self._gen_logical(left_temp, right_temp, '&&', ctx)
                 left_temp = result_temp
-                self.codegen.current_temp = result_temp
+                codegen.current_temp = result_temp
             
             left_type = result_type
         
@@ -415,64 +469,70 @@ class SemanticVisitor(CompiscriptVisitor):
 
     # Visitor para operaciones de igualdad (==, !=)
     def visitEqualityExpr(self, ctx):
-        if ctx.getChildCount() == 1:
-            return self.visit(ctx.relationalExpr(0))
+        # Hijos alternan operando/operador, igual que en visitAdditiveExpr
+        children = ctx.children
+        n = len(children)
+        if n == 1:
+            return self.visit(children[0])
+
+        codegen = self.codegen
+        visit = self.visit
         
         # Visitar la primera expresión y obtener su tipo y temporal
-        left_type = self.visit(ctx.relationalExpr(0))
-        left_temp = self.codegen.current_temp
+        left_type = visit(children[0])
+        left_temp = codegen.current_temp
         result_type = left_type
         
-        for i in range(1, ctx.getChildCount(), 2):
-            if i+1 >= ctx.getChildCount():
-                break
-                
-            op_node = ctx.getChild(i)
-            right_expr = ctx.relationalExpr((i+1)//2)
-            right_type = self.visit(right_expr)
-            right_temp = self.codegen.current_temp
+        for i in range(1, n - 1, 2):
+            op_node = children[i]
+            right_expr = children[i + 1]
+            right_type = visit(right_expr)
+            right_temp = codegen.current_temp
             
-            # Verificación semántica
-            result_type = self.check_comparison(left_type, right_type, op_node)
+            # Verificación semántica (el error del lado izquierdo solo se propaga)
+            result_type = ERROR_TYPE if left_type is ERROR_TYPE else self.check_comparison(left_type, right_type, op_node)
             
             # Generación de código
-            if result_type != ERROR_TYPE:
+            if result_type is not ERROR_TYPE:
                 op_text = op_node.getText()  # '==' o '!='
-                result_temp = self.codegen.generate_comparison(left_temp, right_temp, op_text, ctx)
+                result_temp = self._gen_cmp(left_temp, right_temp, op_text, ctx)
                 left_temp = result_temp
-                self.codegen.current_temp = result_temp
+                codegen.current_temp = result_temp
             
             left_type = right_type
         
         return result_type
 
     def visitRelationalExpr(self, ctx):
-        if ctx.getChildCount() == 1:
-            return self.visit(ctx.additiveExpr(0))
+        # Hijos alternan operando/operador, igual que en visitAdditiveExpr
+        children = ctx.children
+        n = len(children)
+        if n == 1:
+            return self.visit(children[0])
+
+        codegen = self.codegen
+        visit = self.visit
         
         # Visitar la primera expresión y obtener su tipo y temporal
-        left_type = self.visit(ctx.additiveExpr(0))
-        left_temp = self.codegen.current_temp
+        left_type = visit(children[0])
+        left_temp = codegen.current_temp
         result_type = left_type
         
-        for i in range(1, ctx.getChildCount(), 2):
-            if i+1 >= ctx.getChildCount():
-                break
-                
-            op_node = ctx.getChild(i)
-            right_expr = ctx.additiveExpr((i+1)//2)
-            right_type = self.visit(right_expr)
-            right_temp = self.codegen.current_temp
+        for i in range(1, n - 1, 2):
+            op_node = children[i]
+            right_expr = children[i + 1]
+            right_type = visit(right_expr)
+            right_temp = codegen.current_temp
             
-            # Verificación semántica
-            result_type = self.check_relational(left_type, right_type, op_node)
+            # Verificación semántica (el error del lado izquierdo solo se propaga)
+            result_type = ERROR_TYPE if left_type is ERROR_TYPE else self.check_relational(left_type, right_type, op_node)
             
             # Generación de código
-            if result_type != ERROR_TYPE:
+            if result_type is not ERROR_TYPE:
                 op_text = op_node.getText()  # '<', '<=', '>', '>='
-                result_temp = self.codegen.generate_comparison(left_temp, right_temp, op_text, ctx)
+                result_temp = self._gen_cmp(left_temp, right_temp, op_text, ctx)
                 left_temp = result_temp
-                self.codegen.current_temp = result_temp
+                codegen.current_temp = result_temp
             
             left_type = right_type
         
@@ -480,30 +540,36 @@ class SemanticVisitor(CompiscriptVisitor):
 
     # Actualizar el visitUnaryExpr para manejar el operador !
     def visitUnaryExpr(self, ctx):
+        # Caso común: un solo hijo (primaryExpr), sin probar NOT()/MINUS()
+        children = ctx.children
+        if len(children) == 1:
+            return self.visit(children[0])
+
+        codegen = self.codegen
         if ctx.NOT():
             expr_type = self.visit(ctx.unaryExpr())
-            if expr_type != BOOL_TYPE and expr_type != ERROR_TYPE:
+            if expr_type is not BOOL_TYPE and expr_type is not ERROR_TYPE:
                 self.add_error(ctx, f"Operador '!' requiere operando booleano, got {expr_type.name}")
                 return ERROR_TYPE
             
             # Generación de código
-            if expr_type != ERROR_TYPE:
+            if expr_type is not ERROR_TYPE:
                 # caso para operacion de negacion booleana
-                operand_temp = self.codegen.current_temp
+                operand_temp = codegen.current_temp
                 
-                self.codegen.generate_logical_not(operand_temp, ctx)
+                codegen.generate_logical_not(operand_temp, ctx)
             
             return BOOL_TYPE
         elif ctx.MINUS():
             expr_type = self.visit(ctx.unaryExpr())
-            if expr_type != INT_TYPE and expr_type != ERROR_TYPE:
+            if expr_type is not INT_TYPE and expr_type is not ERROR_TYPE:
                 self.add_error(ctx, f"Operador '-' requiere operando entero, got {expr_type.name}")
                 return ERROR_TYPE
             
             # Generación de código
-            if expr_type != ERROR_TYPE:
-                operand_temp = self.codegen.current_temp
-                self.codegen.generate_unary_operation(operand_temp, 'NEG', ctx)  # NEG para negación unaria es el -
+            if expr_type is not ERROR_TYPE:
+                operand_temp = codegen.current_temp
+                codegen.generate_unary_operation(operand_temp, 'NEG', ctx)  # NEG para negación unaria es el -
             
             return INT_TYPE
         else:
@@ -516,26 +582,30 @@ class SemanticVisitor(CompiscriptVisitor):
      
     
     def visitConstantDeclaration(self, ctx):
+        codegen = self.codegen
+        symbol_table = self.symbol_table
         const_name = ctx.Identifier().getText()
 
-        # Verificar si ya está declarado en el ámbito actual
-        if self.symbol_table.is_declared_in_current_scope(const_name):
-            existing_symbol = self.symbol_table.lookup_in_current_scope(const_name)
-            symbol_type = "constante" if existing_symbol and hasattr(existing_symbol, 'is_const') and existing_symbol.is_const else "variable"
+        # Verificar si ya está declarado en el ámbito actual (una sola consulta a la tabla)
+        existing_symbol = symbol_table.lookup_in_current_scope(const_name)
+        if existing_symbol is not None:
+            symbol_type = "constante" if hasattr(existing_symbol, 'is_const') and existing_symbol.is_const else "variable"
             self.add_error(ctx, f"Constante '{const_name}' ya declarada como {symbol_type} en este ámbito")
             return
         
-        declared_type = self.get_type_from_ctx(ctx.typeAnnotation().type_()) if ctx.typeAnnotation() else None
+        type_annotation = ctx.typeAnnotation()
+        declared_type = self.get_type_from_ctx(type_annotation.type_()) if type_annotation else None
         
         # inicializacion obligatoria
-        if not ctx.expression():
+        init_expr = ctx.expression()
+        if not init_expr:
             self.add_error(ctx, f"Constante '{const_name}' debe ser inicializada")
             return
             
         # tipo del valor inicializador
-        self.codegen.in_assignment_context = True
-        initializer_type = self.visit(ctx.expression())
-        self.codegen.in_assignment_context = False
+        codegen.in_assignment_context = True
+        initializer_type = self.visit(init_expr)
+        codegen.in_assignment_context = False
         
         # si notiene tipo declarado, inferirlo del inicializador
         if not declared_type:
@@ -546,12 +616,12 @@ class SemanticVisitor(CompiscriptVisitor):
             declared_type = initializer_type
         
         # compatibilidad de tipos
-        if initializer_type and not initializer_type.can_assign_to(declared_type):
+        if initializer_type and initializer_type is not ERROR_TYPE and not initializer_type.can_assign_to(declared_type):
             self.add_error(ctx, f"No se puede asignar {initializer_type.name} a {declared_type.name} en constante")
             return
             
         # Crear símbolo
-        current_scope_id = self.symbol_table.scopes[-1].scope_id
+        current_scope_id = symbol_table.current_scope_id
         symbol = VariableSymbol(
             name=const_name,
             type_=declared_type,
@@ -559,95 +629,95 @@ class SemanticVisitor(CompiscriptVisitor):
             is_const=True
         )
         
-        try:
-            self.symbol_table.add_symbol(symbol)
-        except Exception as e:
-            self.add_error(ctx, str(e))
+        err = symbol_table.try_add_symbol(symbol)
+        if err:
+            self.add_error(ctx, err)
         
         # GENERACIÓN DE CÓDIGO
         if not self.errors:
-            init_value = self.codegen.current_temp
-            const_address = self.codegen.get_variable_address(const_name)
-            self.codegen.generate_assignment(const_address, init_value, ctx)
+            init_value = codegen.current_temp
+            const_address = codegen.get_variable_address(const_name)
+            codegen.generate_assignment(const_address, init_value, ctx)
         
-        self.codegen.end_expression()
+        codegen.end_expression()
         
-        return None
+        # Devolver el símbolo creado para que el llamador no tenga que buscarlo por nombre
+        return symbol
     
     def visitLiteralExpr(self, ctx):
-        # Análisis semántico existente
-        if ctx.NULL():
-            result_type = NULL_TYPE
-        elif ctx.TRUE() or ctx.FALSE():
-            result_type = BOOL_TYPE
-        elif ctx.Literal():
-            literal = ctx.Literal().getText()
+        # Un solo vistazo al primer token decide la alternativa (null/true/false/Literal/array)
+        token = ctx.start
+        token_type = token.type
+
+        # null, true, false
+        result_type = _KEYWORD_LITERAL_TYPES.get(token_type)
+        if result_type is not None:
+            self.codegen.generate_load_immediate(token.text, ctx)
+            return result_type
+
+        if token_type == _LITERAL_TOKEN:
+            literal = token.text
             if literal[0] == '"':  # Es string
                 result_type = STRING_TYPE
             else:  # Es numero
                 result_type = INT_TYPE
-        elif ctx.arrayLiteral():
-            result_type = self.visit(ctx.arrayLiteral())
-        else:
-            result_type = None
-        
-        # Generación de código
-        if result_type != ERROR_TYPE:
-            if ctx.NULL():
-                self.codegen.generate_load_immediate('null', ctx)
-            elif ctx.TRUE():
-                self.codegen.generate_load_immediate('true', ctx)
-            elif ctx.FALSE():
-                self.codegen.generate_load_immediate('false', ctx)
-            elif ctx.Literal():
-                literal = ctx.Literal().getText()
-                self.codegen.generate_load_immediate(literal, ctx)
-            # Para arrays, es una implementación más compleja
-            # DE MOMENTO TA PENDIENTE
-        
-        return result_type
+            self.codegen.generate_load_immediate(literal, ctx)
+            return result_type
+
+        # Para arrays, visitArrayLiteral deja los valores de los elementos en current_temp
+        # (única alternativa restante: el hijo ya es el arrayLiteral, sin escanear con el accessor)
+        array_ctx = ctx.getChild(0)
+        if type(array_ctx) is CompiscriptParser.ArrayLiteralContext:
+            return self.visitArrayLiteral(array_ctx)
+        return None
     
     # Determinar el tipo de un array literal
     def visitArrayLiteral(self, ctx):
+        exprs = ctx.expression()
 
-        if not ctx.expression() or len(ctx.expression()) == 0:
+        if not exprs:
             return ArrayType(NULL_TYPE, [0])  # Array vacío de tipo desconocido
 
         # Verificar que todos los elementos sean del mismo tipo y guardar los valores
-        element_values = []
-        element_type = self.visit(ctx.expression(0))
-        element_values.append(self.codegen.current_temp)
-
-        for expr in ctx.expression()[1:]:
-            current_type = self.visit(expr)
-            element_values.append(self.codegen.current_temp)
-            if current_type != element_type:
+        visit = self.visit
+        codegen = self.codegen
+        element_type = visit(exprs[0])
+        element_values = _ArrayLiteralValues((codegen.current_temp,))
+
+        for expr in exprs[1:]:
+            current_type = visit(expr)
+            element_values.append(codegen.current_temp)
+            # `is` resuelve los primitivos; tipos de clase/array se comparan por nombre
+            if current_type is not element_type and current_type != element_type:
                 self.add_error(ctx, f"Elementos de array con tipos inconsistentes: {element_type.name} vs {current_type.name}")
                 return None
 
-        # Store the element values for later initialization
-        # We'll pass this through current_temp as a special marker
-        self.codegen.current_temp = ('array_literal', element_values)
+        # Los valores viajan en current_temp; su tipo los distingue de un temporal
+        codegen.current_temp = element_values
 
-        return ArrayType(element_type, [len(ctx.expression())])
+        return ArrayType(element_type, [len(exprs)])
 
     def visitVariableDeclaration(self, ctx):
+        codegen = self.codegen
+        symbol_table = self.symbol_table
         var_name = ctx.Identifier().getText()
         
-        if self.symbol_table.is_declared_in_current_scope(var_name):
-            existing_symbol = self.symbol_table.lookup_in_current_scope(var_name)
-            symbol_type = "constante" if existing_symbol and hasattr(existing_symbol, 'is_const') and existing_symbol.is_const else "variable"
+        existing_symbol = symbol_table.lookup_in_current_scope(var_name)
+        if existing_symbol is not None:
+            symbol_type = "constante" if hasattr(existing_symbol, 'is_const') and existing_symbol.is_const else "variable"
             self.add_error(ctx, f"Variable '{var_name}' ya declarada como {symbol_type} en este ámbito")
             return
         
-        declared_type = self.get_type_from_ctx(ctx.typeAnnotation().type_()) if ctx.typeAnnotation() else None
+        type_annotation = ctx.typeAnnotation()
+        declared_type = self.get_type_from_ctx(type_annotation.type_()) if type_annotation else None
         
         # unica VISITA con contexto de asignación
+        initializer = ctx.initializer()
         initializer_type = None
-        if ctx.initializer():
-            self.codegen.in_assignment_context = True
-            initializer_type = self.visit(ctx.initializer().expression())
-            self.codegen.in_assignment_context = False
+        if initializer:
+            codegen.in_assignment_context = True
+            initializer_type = self.visit(initializer.expression())
+            codegen.in_assignment_context = False
         
         # Determinar tipo y si fue inferido
         if declared_type:
@@ -657,7 +727,7 @@ class SemanticVisitor(CompiscriptVisitor):
             final_type = initializer_type if initializer_type else NULL_TYPE
             is_type_inferred = True
 
-        current_scope_id = self.symbol_table.scopes[-1].scope_id
+        current_scope_id = symbol_table.current_scope_id
         symbol = VariableSymbol(
             name=var_name,
             type_=final_type,
@@ -667,53 +737,56 @@ class SemanticVisitor(CompiscriptVisitor):
         )
 
         # Verificar asignación inicial
-        if ctx.initializer():
+        if initializer:
             expr_type = initializer_type
-            if expr_type and expr_type != ERROR_TYPE and not expr_type.can_assign_to(final_type):
+            if expr_type and expr_type is not ERROR_TYPE and not expr_type.can_assign_to(final_type):
                 self.add_error(ctx, f"No se puede asignar {expr_type.name} a {final_type.name}")
 
-        try:
-            self.symbol_table.add_symbol(symbol)
-        except Exception as e:
-            self.add_error(ctx, str(e))
+        err = symbol_table.try_add_symbol(symbol)
+        if err:
+            self.add_error(ctx, err)
 
         # GENERACIÓN DE CÓDIGO (ya visitamos arriba)
-        if not self.errors and ctx.initializer():
-            init_value = self.codegen.current_temp  # Puede ser literal, temporal, o array literal
+        if not self.errors and initializer:
+            init_value = codegen.current_temp  # Puede ser literal, temporal, o array literal
 
             # Check if it's an array literal initialization
-            if isinstance(init_value, tuple) and init_value[0] == 'array_literal':
+            if type(init_value) is _ArrayLiteralValues:
                 # Generate code to initialize each array element
-                element_values = init_value[1]
-                var_address = self.codegen.get_variable_address(var_name)
-                self.codegen.generate_array_literal_init(var_address, element_values, ctx)
+                var_address = codegen.get_variable_address(var_name)
+                codegen.generate_array_literal_init(var_address, init_value, ctx)
             else:
                 # Regular assignment
-                var_address = self.codegen.get_variable_address(var_name)
-                self.codegen.generate_assignment(var_address, init_value, ctx)
+                var_address = codegen.get_variable_address(var_name)
+                codegen.generate_assignment(var_address, init_value, ctx)
         
         # Si se está dentro de una clase, registrar como atributo
         if self.current_class:
             self.current_class.add_attribute(symbol)
 
-        self.codegen.end_expression()
+        codegen.end_expression()
 
-        return None
+        # Devolver el símbolo creado para que el llamador no tenga que buscarlo por nombre
+        return symbol
 
     
     #Versión flexible de verificación de tipos
     def check_assignment(self, source_type, target_type, is_nullable):
         
-        if source_type == NULL_TYPE:
+        if source_type is NULL_TYPE:
             return is_nullable
         return source_type.can_assign_to(target_type)
     
     def visitAssignment(self, ctx):
+        codegen = self.codegen
+        expressions = ctx.expression()
+        identifier = ctx.Identifier()
+
         # Caso b) property assign: hay DOS expresiones en el contexto,  baseExpr . Identifier = valueExpr
-        if len(ctx.expression()) == 2 and ctx.Identifier():
-            base_expr = ctx.expression(0)
-            value_expr = ctx.expression(1)
-            member_name = ctx.Identifier().getText()
+        if len(expressions) == 2 and identifier:
+            base_expr = expressions[0]
+            value_expr = expressions[1]
+            member_name = identifier.getText()
 
             # PROBLEMA ANTERIOR: visitamos base primero
             # Esto carga 'this' pero luego al visitar value_expr,
@@ -721,17 +794,17 @@ class SemanticVisitor(CompiscriptVisitor):
             
             # SOLUCIÓN: Visitar value PRIMERO, guardar su temporal
             value_type = self.visit(value_expr)
-            value_temp = self.codegen.current_temp  # Guardar INMEDIATAMENTE
+            value_temp = codegen.current_temp  # Guardar INMEDIATAMENTE
 
             # CRITICAL FIX: Mark value_temp as used to prevent it from being
             # reused when we visit the base expression
-            self.codegen.mark_temp_used(value_temp)
+            codegen.mark_temp_used(value_temp)
 
             # AHORA sí visitar base (puede ser 'this' o una variable)
             base_type = self.visit(base_expr)
-            base_temp = self.codegen.current_temp
+            base_temp = codegen.current_temp
 
-            if base_type == ERROR_TYPE or value_type == ERROR_TYPE:
+            if base_type is ERROR_TYPE or value_type is ERROR_TYPE:
                 return ERROR_TYPE
 
             # Debe ser instancia de clase
@@ -740,8 +813,8 @@ class SemanticVisitor(CompiscriptVisitor):
                 self.add_error(ctx, f"No se puede asignar a miembro '{member_name}' de tipo no-clase")
                 return ERROR_TYPE
 
-            # Buscar atributo en la jerarquía
-            attr = self.symbol_table.lookup_in_class(cls_sym.name, member_name)
+            # Buscar atributo en la jerarquía (ya aplanada en members)
+            attr = cls_sym.members.get(member_name)
             if not isinstance(attr, VariableSymbol):
                 self.add_error(ctx, f"Miembro '{member_name}' no existe en clase '{cls_sym.name}'")
                 return ERROR_TYPE
@@ -750,20 +823,20 @@ class SemanticVisitor(CompiscriptVisitor):
                 self.add_error(ctx, f"No se puede reasignar la constante '{member_name}'")
                 return ERROR_TYPE
 
-            if value_type != ERROR_TYPE and not value_type.can_assign_to(attr.type):
+            if value_type is not ERROR_TYPE and not value_type.can_assign_to(attr.type):
                 self.add_error(ctx, f"No se puede asignar {value_type.name} a {attr.type.name}")
                 return ERROR_TYPE
 
             # GENERACIÓN DE CÓDIGO con temporales CORRECTOS
             if not self.errors:
-                self.codegen.generate_property_store(
+                codegen.generate_property_store(
                     base_temp, cls_sym.name, member_name, value_temp, ctx
                 )
 
             return value_type
 
         # Caso a) asignación simple a variable
-        var_name = ctx.Identifier().getText() if ctx.Identifier() else None
+        var_name = identifier.getText() if identifier else None
         if not var_name:
             return self.visitChildren(ctx)
 
@@ -777,29 +850,30 @@ class SemanticVisitor(CompiscriptVisitor):
             self.add_error(ctx, f"No se puede reasignar la constante '{var_name}'")
             return ERROR_TYPE
 
-        expr_ctx = ctx.expression()[0] if isinstance(ctx.expression(), list) else ctx.expression()
-        self.codegen.in_assignment_context = True
+        # ctx.expression() sin índice siempre devuelve lista (ya se usó len arriba)
+        expr_ctx = expressions[0]
+        codegen.in_assignment_context = True
         expr_type = self.visit(expr_ctx)
-        self.codegen.in_assignment_context = False
+        codegen.in_assignment_context = False
 
         # Caso especial: variable con tipo inferido
-        if (symbol.type == NULL_TYPE and 
+        if (symbol.type is NULL_TYPE and 
             symbol.is_type_inferred and
-            expr_type != NULL_TYPE and 
-            expr_type != VOID_TYPE and 
-            expr_type != ERROR_TYPE):
+            expr_type is not NULL_TYPE and 
+            expr_type is not VOID_TYPE and 
+            expr_type is not ERROR_TYPE):
             symbol.type = expr_type
         else:
-            if expr_type != ERROR_TYPE and not expr_type.can_assign_to(symbol.type):
+            if expr_type is not ERROR_TYPE and not expr_type.can_assign_to(symbol.type):
                 self.add_error(ctx, f"No se puede asignar {expr_type.name} a {symbol.type.name}")
 
         # GENERACIÓN DE CÓDIGO
         if not self.errors:
-            expr_value = self.codegen.current_temp
-            var_address = self.codegen.get_variable_address(var_name)
-            self.codegen.generate_assignment(var_address, expr_value, ctx)
+            expr_value = codegen.current_temp
+            var_address = codegen.get_variable_address(var_name)
+            codegen.generate_assignment(var_address, expr_value, ctx)
 
-        self.codegen.end_expression()
+        codegen.end_expression()
 
         return expr_type if expr_type else ERROR_TYPE
 
@@ -808,10 +882,11 @@ class SemanticVisitor(CompiscriptVisitor):
     #
     #
     def visitBlock(self, ctx):
+        symbol_table = self.symbol_table
         # Solo crear nuevo ámbito si no es función/clase (ya tienen su propio ámbito)
-        current_scope = self.symbol_table.scopes[-1]
-        if current_scope.scope_type not in ['function', 'class']:
-            self.symbol_table.enter_scope("block")
+        new_scope = symbol_table.current_scope_type not in _NO_NEW_SCOPE
+        if new_scope:
+            symbol_table.enter_scope("block")
         
         # Reset del flag de código muerto al inicio de cada bloque
         old_unreachable = self.unreachable_code
@@ -822,8 +897,8 @@ class SemanticVisitor(CompiscriptVisitor):
         # Restaurar el estado previo
         self.unreachable_code = old_unreachable
         
-        if current_scope.scope_type not in ['function', 'class']:
-            self.symbol_table.exit_scope()
+        if new_scope:
+            symbol_table.exit_scope()
         
         return result
     
@@ -846,20 +921,23 @@ class SemanticVisitor(CompiscriptVisitor):
         return symbol.type
         
     def visitFunctionDeclaration(self, ctx):
+        codegen = self.codegen
+        symbol_table = self.symbol_table
         func_name = ctx.Identifier().getText()
 
         # identificar el inicio de la nueva funcion
-        self.codegen.set_current_function(func_name)
+        codegen.set_current_function(func_name)
 
-        return_type = self.get_type_from_ctx(ctx.type_()) if ctx.type_() else VOID_TYPE
+        type_ctx = ctx.type_()
+        return_type = self.get_type_from_ctx(type_ctx) if type_ctx else VOID_TYPE
         
-        if return_type == VOID_TYPE and ctx.type_():
+        if return_type is VOID_TYPE and type_ctx:
             self.add_error(ctx, f"Uso explícito de 'void' no permitido en funciones")
             return
         
         # CHECK FOR DUPLICATE FUNCTIONS IN CURRENT SCOPE
-        if self.symbol_table.is_declared_in_current_scope(func_name):
-            existing_symbol = self.symbol_table.lookup_in_current_scope(func_name)
+        existing_symbol = symbol_table.lookup_in_current_scope(func_name)
+        if existing_symbol is not None:
             if hasattr(existing_symbol, 'category'):
                 symbol_type = existing_symbol.category
             else:
@@ -867,7 +945,7 @@ class SemanticVisitor(CompiscriptVisitor):
             self.add_error(ctx, f"Función '{func_name}' ya declarada como {symbol_type} en este ámbito")
             return
         
-        current_scope_id = self.symbol_table.scopes[-1].scope_id
+        current_scope_id = symbol_table.current_scope_id
         func_symbol = FunctionSymbol(
             name=func_name,
             return_type=return_type,
@@ -875,110 +953,111 @@ class SemanticVisitor(CompiscriptVisitor):
         )
         
         # Registrar función en ámbito padre
-        try:
-            self.symbol_table.add_symbol(func_symbol)
-        except Exception as e:
-            self.add_error(ctx, str(e))
+        err = symbol_table.try_add_symbol(func_symbol)
+        if err:
+            self.add_error(ctx, err)
             return
             
         # Entrar en ámbito de función
-        self.symbol_table.enter_scope("function")
+        symbol_table.enter_scope("function")
         self.current_function = func_symbol
         
         # Procesar parámetros
-        if ctx.parameters():
-            for i, param_ctx in enumerate(ctx.parameters().parameter()):
-                param_name = param_ctx.Identifier().getText()
-                param_type = self.get_type_from_ctx(param_ctx.type_() if param_ctx.type_() else None)
-                
+        # En la misma pasada se arma la lista (nombre, tipo) para el codegen
+        parameters = []
+        params_ctx = ctx.parameters()
+        if params_ctx:
+            get_type = self.get_type_from_ctx
+            try_add_symbol = symbol_table.try_add_symbol
+            for param_ctx in params_ctx.parameter():
                 param_symbol = VariableSymbol(
-                    name=param_name,
-                    type_=param_type or VOID_TYPE,
+                    name=param_ctx.Identifier().getText(),
+                    type_=get_type(param_ctx.type_()) or VOID_TYPE,
                     scope_id=current_scope_id,
                     is_const=False
                 )
                 
                 func_symbol.add_parameter(param_symbol)
-                try:
-                    self.symbol_table.add_symbol(param_symbol)
-                except Exception as e:
-                    self.add_error(param_ctx, str(e))
+                parameters.append((param_symbol.name, param_symbol.type))
+                err = try_add_symbol(param_symbol)
+                if err:
+                    self.add_error(param_ctx, err)
         
         # Generate function code only if no errors
+        block = ctx.block()
         if not self.errors:
-            # Prepare parameters for code generation
-            parameters = []
-            if ctx.parameters():
-                for param_ctx in ctx.parameters().parameter():
-                    param_name = param_ctx.Identifier().getText()
-                    param_type = self.get_type_from_ctx(param_ctx.type_() if param_ctx.type_() else None)
-                    parameters.append((param_name, param_type or VOID_TYPE))
-
-            def body_func():
-                self.visit(ctx.block())
 
             # Generate function declaration code
-            self.codegen.generate_function_declaration(
+            codegen.generate_function_declaration(
                 function_name=func_name,
                 parameters=parameters,
                 return_type=return_type,
-                body_func=body_func,
+                body_func=partial(self.visit, block),
                 ctx=ctx
             )
         else:
             # Still perform semantic analysis
-            self.visit(ctx.block())
+            self.visit(block)
         
         # VALIDATE RETURN TYPE - Check if all return statements match declared type
-        if return_type != VOID_TYPE:
-            if not func_symbol.return_statements:
+        if return_type is not VOID_TYPE:
+            if not func_symbol.has_return:
                 self.add_error(ctx, f"Función '{func_name}' debe retornar un valor")
             else:
-                # Check each return statement type
-                for ret_type in func_symbol.return_statements:
-                    if ret_type != ERROR_TYPE and ret_type != return_type:
-                        self.add_error(ctx, f"Tipo de retorno inconsistente en función '{func_name}'. Esperado: {return_type.name}, encontrado: {ret_type.name}")
+                # Check each mismatching return statement type
+                for ret_type in func_symbol.bad_returns:
+                    self.add_error(ctx, f"Tipo de retorno inconsistente en función '{func_name}'. Esperado: {return_type.name}, encontrado: {ret_type.name}")
         else:
             # VOID functions should not have return values
-            for ret_type in func_symbol.return_statements:
-                if ret_type != VOID_TYPE and ret_type != ERROR_TYPE:
-                    self.add_error(ctx, f"Función void '{func_name}' no debe retornar valor")
+            for ret_type in func_symbol.bad_returns:
+                self.add_error(ctx, f"Función void '{func_name}' no debe retornar valor")
         
         # Restaurar ámbito padre
-        self.symbol_table.exit_scope()
+        symbol_table.exit_scope()
         self.current_function = None
 
         # Clear the current activation record so subsequent code is treated as global
-        self.codegen.current_ar = None
+        codegen.current_ar = None
 
         # Si está dentro de clase y no es 'constructor', agregar a los métodos
         if self.current_class:
             self.current_class.add_method(func_symbol)
         
-        return None
+        # Devolver el símbolo creado para que el llamador no tenga que buscarlo por nombre
+        return func_symbol
     
     # En semantic_visitor.py
     def visitReturnStatement(self, ctx):
         # Verificar código muerto antes del return
-        self.check_unreachable_code(ctx, "statement return")
+        if self.unreachable_code:
+            self.add_warning(ctx, "Código muerto: statement return nunca se ejecutará")
 
         if not self.current_function:
             self.add_error(ctx, "return fuera de función")
             return
 
-        expr_type = self.visit(ctx.expression()) if ctx.expression() else VOID_TYPE
+        expr_ctx = ctx.expression()
+        expr_type = self.visit(expr_ctx) if expr_ctx else VOID_TYPE
 
-        if self.current_function.return_type == VOID_TYPE:
-            if ctx.expression():
+        func_symbol = self.current_function
+        return_type = func_symbol.return_type
+        # Los returns que no coinciden se guardan aparte para que la validación
+        # de la función solo recorra esos
+        if return_type is VOID_TYPE:
+            if expr_ctx:
                 self.add_error(ctx, "Función void no debe retornar valor")
-        elif expr_type != self.current_function.return_type:
-            self.add_error(ctx, f"Tipo de retorno no coincide. Esperado: {self.current_function.return_type.name}")
+            if expr_type is not VOID_TYPE and expr_type is not ERROR_TYPE:
+                func_symbol.bad_returns.append(expr_type)
+        elif expr_type != return_type:
+            self.add_error(ctx, f"Tipo de retorno no coincide. Esperado: {return_type.name}")
+            if expr_type is not ERROR_TYPE:
+                func_symbol.bad_returns.append(expr_type)
 
-        self.current_function.return_statements.append(expr_type)
+        func_symbol.has_return = True
 
         # Generate return statement code only if no errors
         if not self.errors and self.current_function:
-            value_temp = self.codegen.current_temp if ctx.expression() else None
+            value_temp = self.codegen.current_temp if expr_ctx else None
             self.codegen.generate_return_statement(value_temp, ctx)
 
         # Marcar que cualquier código después de este return es inalcanzable
@@ -990,10 +1069,11 @@ class SemanticVisitor(CompiscriptVisitor):
     def visitCallExpr(self, ctx):
         # Get function name from the leftHandSide parent
         parent_ctx = ctx.parentCtx
-        if not parent_ctx or not hasattr(parent_ctx, 'primaryAtom'):
+        primary_atom = getattr(parent_ctx, 'primaryAtom', None)
+        if primary_atom is None:
             return ERROR_TYPE
 
-        func_name = parent_ctx.primaryAtom().getText()
+        func_name = primary_atom().getText()
         func_symbol = self.symbol_table.lookup(func_name)
         
         if not func_symbol:
@@ -1007,26 +1087,24 @@ class SemanticVisitor(CompiscriptVisitor):
         # Get arguments
         args = []
         arg_temps = []  # For code generation
-        if ctx.arguments():
-            for arg_expr in ctx.arguments().expression():
+        args_ctx = ctx.arguments()
+        if args_ctx:
+            # Los errores solo se acumulan: si ya hay alguno no se generará la llamada
+            # y los temporales no hacen falta
+            emit = not self.errors
+            codegen = self.codegen
+            for arg_expr in args_ctx.expression():
                 arg_type = self.visit(arg_expr)
                 args.append(arg_type)
-                if self.codegen.current_temp:
-                    arg_temps.append(self.codegen.current_temp)
+                if emit and codegen.current_temp:
+                    arg_temps.append(codegen.current_temp)
 
-        # Validate number of arguments
-        expected_params = len(func_symbol.parameters)
-        actual_args = len(args)
-
-        if actual_args != expected_params:
-            self.add_error(ctx, f"Función '{func_name}' espera {expected_params} argumentos, pero recibió {actual_args}")
+        # Validate number and types of arguments
+        if not self._check_arguments(ctx, func_name, func_symbol.parameters, args,
+                                     "Función '%s' espera %d argumentos, pero recibió %d",
+                                     "Argumento %d de función '%s': esperado %s, encontrado %s"):
             return func_symbol.return_type
 
-        # Validate argument types
-        for i, (param, arg_type) in enumerate(zip(func_symbol.parameters, args)):
-            if arg_type != ERROR_TYPE and not arg_type.can_assign_to(param.type):
-                self.add_error(ctx, f"Argumento {i+1} de función '{func_name}': esperado {param.type.name}, encontrado {arg_type.name}")
-
         # Generate function call code only if no errors
         if not self.errors:
             result_temp = self.codegen.generate_function_call(func_name, arg_temps, ctx)
@@ -1036,52 +1114,57 @@ class SemanticVisitor(CompiscriptVisitor):
 
     def visitIndexExpr(self, ctx):
         """Visit array indexing expression: arr[index]"""
+        codegen = self.codegen
         # Get the parent context to find the array name
         parent_ctx = ctx.parentCtx
-        if not parent_ctx or not hasattr(parent_ctx, 'primaryAtom'):
+        primary_atom = getattr(parent_ctx, 'primaryAtom', None)
+        if primary_atom is None:
             return ERROR_TYPE
 
-        array_name = parent_ctx.primaryAtom().getText()
+        array_name = primary_atom().getText()
         array_symbol = self.symbol_table.lookup(array_name)
 
         if not array_symbol:
             self.add_error(ctx, f"Array '{array_name}' no declarado")
             return ERROR_TYPE
 
-        if not isinstance(array_symbol.type, ArrayType):
+        array_type = array_symbol.type
+        if type(array_type) is not ArrayType:
             self.add_error(ctx, f"'{array_name}' no es un array")
             return ERROR_TYPE
 
         # Visit the index expression
         index_type = self.visit(ctx.expression())
-        if index_type != INT_TYPE and index_type != ERROR_TYPE:
+        if index_type is not INT_TYPE and index_type is not ERROR_TYPE:
             self.add_error(ctx, f"Índice de array debe ser integer, encontrado {index_type.name}")
             return ERROR_TYPE
 
         # Generate code for array access (load)
         if not self.errors:
-            index_temp = self.codegen.current_temp
-            result_temp = self.codegen.generate_array_access(array_name, index_temp, ctx)
-            self.codegen.current_temp = result_temp
+            index_temp = codegen.current_temp
+            result_temp = codegen.generate_array_access(array_name, index_temp, ctx)
+            codegen.current_temp = result_temp
 
         # Return the element type of the array
-        return array_symbol.type.element_type
+        return array_type.element_type
 
     def visitAssignExpr(self, ctx):
         """Visit assignment expression: lhs = value"""
+        codegen = self.codegen
         # Check if lhs contains array indexing
         lhs_ctx = ctx.lhs
 
         # Check if lhs has suffixOp (array indexing or property access)
-        has_index = False
-        if hasattr(lhs_ctx, 'suffixOp') and lhs_ctx.suffixOp():
-            for suffix in lhs_ctx.suffixOp():
-                if hasattr(suffix, 'expression'):  # This is IndexExpr
-                    has_index = True
-                    break
+        suffix_ops = lhs_ctx.suffixOp() if hasattr(lhs_ctx, 'suffixOp') else []
+        index_ctx = None
+        for suffix in suffix_ops:
+            # Comparar el tipo exacto evita el AttributeError de hasattr en sufijos . y ()
+            if type(suffix) is CompiscriptParser.IndexExprContext:
+                index_ctx = suffix
+                break
 
         # Handle array index assignment: arr[index] = value
-        if has_index:
+        if index_ctx is not None:
             # Get array name
             array_name = lhs_ctx.primaryAtom().getText()
             array_symbol = self.symbol_table.lookup(array_name)
@@ -1090,46 +1173,38 @@ class SemanticVisitor(CompiscriptVisitor):
                 self.add_error(ctx, f"Array '{array_name}' no declarado")
                 return ERROR_TYPE
 
-            if not isinstance(array_symbol.type, ArrayType):
+            array_type = array_symbol.type
+            if type(array_type) is not ArrayType:
                 self.add_error(ctx, f"'{array_name}' no es un array")
                 return ERROR_TYPE
 
-            # Find the IndexExpr suffix
-            index_ctx = None
-            for suffix in lhs_ctx.suffixOp():
-                if hasattr(suffix, 'expression'):
-                    index_ctx = suffix
-                    break
-
-            if not index_ctx:
-                return ERROR_TYPE
-
             # Visit index expression FIRST
             index_type = self.visit(index_ctx.expression())
-            if index_type != INT_TYPE and index_type != ERROR_TYPE:
+            if index_type is not INT_TYPE and index_type is not ERROR_TYPE:
                 self.add_error(ctx, f"Índice de array debe ser integer, encontrado {index_type.name}")
                 return ERROR_TYPE
-            index_temp = self.codegen.current_temp
+            index_temp = codegen.current_temp
 
             # Visit value expression
             value_type = self.visit(ctx.assignmentExpr())
-            value_temp = self.codegen.current_temp
+            value_temp = codegen.current_temp
 
             # Type check
-            element_type = array_symbol.type.element_type
-            if value_type != ERROR_TYPE and not value_type.can_assign_to(element_type):
+            element_type = array_type.element_type
+            if value_type is not ERROR_TYPE and not value_type.can_assign_to(element_type):
                 self.add_error(ctx, f"No se puede asignar {value_type.name} a array de {element_type.name}")
                 return ERROR_TYPE
 
             # Generate array store code
             if not self.errors:
-                self.codegen.generate_array_assignment(array_name, index_temp, value_temp, ctx)
+                codegen.generate_array_assignment(array_name, index_temp, value_temp, ctx)
 
             return value_type
 
         # Handle simple variable assignment: var = value
-        if hasattr(lhs_ctx, 'primaryAtom') and not lhs_ctx.suffixOp():
-            var_name = lhs_ctx.primaryAtom().getText()
+        primary_atom = getattr(lhs_ctx, 'primaryAtom', None)
+        if primary_atom is not None and not suffix_ops:
+            var_name = primary_atom().getText()
             symbol = self.symbol_table.lookup(var_name)
 
             if not symbol:
@@ -1142,17 +1217,17 @@ class SemanticVisitor(CompiscriptVisitor):
 
             # Visit value expression
             value_type = self.visit(ctx.assignmentExpr())
-            value_temp = self.codegen.current_temp
+            value_temp = codegen.current_temp
 
             # Type check
-            if value_type != ERROR_TYPE and not value_type.can_assign_to(symbol.type):
+            if value_type is not ERROR_TYPE and not value_type.can_assign_to(symbol.type):
                 self.add_error(ctx, f"No se puede asignar {value_type.name} a {symbol.type.name}")
                 return ERROR_TYPE
 
             # Generate assignment code
             if not self.errors:
-                var_address = self.codegen.get_variable_address(var_name)
-                self.codegen.generate_assignment(var_address, value_temp, ctx)
+                var_address = codegen.get_variable_address(var_name)
+                codegen.generate_assignment(var_address, value_temp, ctx)
 
             return value_type
 
@@ -1161,33 +1236,32 @@ class SemanticVisitor(CompiscriptVisitor):
 
     # CONTROL FLOW VALIDATION
     def visitIfStatement(self, ctx):
-        condition_type = self.visit(ctx.expression())
-        if condition_type != BOOL_TYPE and condition_type != ERROR_TYPE:
-            self.add_error(ctx.expression(), f"Condición de 'if' debe ser boolean, encontrado {condition_type.name}")
+        cond_expr = ctx.expression()
+        then_block = ctx.block(0)
+        else_block = ctx.block(1)
+
+        # Con errores previos no se genera código: una condición true/false literal
+        # no necesita visitarse para saber que es boolean
+        if not (self.errors and self.is_bool_literal(cond_expr)):
+            self._visit_condition(cond_expr, 'if')
 
         # Generate code only if no errors
         if not self.errors:
             condition_temp = self.codegen.current_temp
+            visit = self.visit
 
-            def then_statements():
-                self.visit(ctx.block(0))  # if block
-
-            def else_statements():
-                if ctx.block(1):  # else block exists
-                    self.visit(ctx.block(1))
-
-            # Generate if-else code
+            # Generate if-else code (los callbacks son partial sobre visit, sin closures)
             self.codegen.generate_if_else(
                 condition_temp=condition_temp,
-                then_statements=then_statements if ctx.block(0) else None,
-                else_statements=else_statements if ctx.block(1) else None,
+                then_statements=partial(visit, then_block) if then_block else None,
+                else_statements=partial(visit, else_block) if else_block else None,
                 ctx=ctx
             )
         else:
             # Still visit for semantic analysis
-            self.visit(ctx.block(0))  # if block
-            if ctx.block(1):  # else block
-                self.visit(ctx.block(1))
+            self.visit(then_block)  # if block
+            if else_block:  # else block
+                self.visit(else_block)
 
         return None
     
@@ -1196,11 +1270,11 @@ class SemanticVisitor(CompiscriptVisitor):
         # Visit the expression to get its type
         expr_type = self.visit(ctx.expression())
 
-        if expr_type == ERROR_TYPE:
+        if expr_type is ERROR_TYPE:
             return None
 
         # Validate that the type is printable (integer, string, boolean)
-        if expr_type not in [INT_TYPE, STRING_TYPE, BOOL_TYPE]:
+        if expr_type not in _PRINTABLE_TYPES:
             self.add_error(ctx, f"print() no puede imprimir tipo '{expr_type.name}'")
             return None
 
@@ -1211,120 +1285,97 @@ class SemanticVisitor(CompiscriptVisitor):
 
         return None
 
-    def visitWhileStatement(self, ctx):
-        # Enter loop context first
-        prev_in_loop = self.in_loop
-        self.in_loop = True
+    @contextmanager
+    def _loop_context(self):
+        """Marca el cuerpo como parte de un bucle (para break/continue) y restaura al salir"""
         self.loop_depth += 1
+        try:
+            yield
+        finally:
+            self.loop_depth -= 1
 
-        # Generate code only if no errors
-        if not self.errors:
-            def condition_func():
-                condition_type = self.visit(ctx.expression())
-                if condition_type != BOOL_TYPE and condition_type != ERROR_TYPE:
-                    self.add_error(ctx.expression(), f"Condición de 'while' debe ser boolean, encontrado {condition_type.name}")
-                return self.codegen.current_temp
-
-            def body_func():
-                self.visit(ctx.block())
-
-            # Generate while loop code
-            self.codegen.generate_while_loop(
-                condition_func=condition_func,
-                body_func=body_func,
-                ctx=ctx
-            )
-        else:
-            # Still perform semantic analysis
-            condition_type = self.visit(ctx.expression())
-            if condition_type != BOOL_TYPE and condition_type != ERROR_TYPE:
-                self.add_error(ctx.expression(), f"Condición de 'while' debe ser boolean, encontrado {condition_type.name}")
-            self.visit(ctx.block())
+    def _visit_condition(self, cond_expr, statement):
+        """Visita la condición de `statement`, exige boolean y devuelve su temporal"""
+        condition_type = self.visit(cond_expr)
+        if condition_type is not BOOL_TYPE and condition_type is not ERROR_TYPE:
+            self.add_error(cond_expr, _CONDITION_NOT_BOOL, statement, condition_type.name)
+        return self.codegen.current_temp
 
-        # Exit loop context
-        self.loop_depth -= 1
-        self.in_loop = prev_in_loop or self.loop_depth > 0
+    def visitWhileStatement(self, ctx):
+        cond_expr = ctx.expression()
+        block = ctx.block()
+
+        # Enter loop context first
+        with self._loop_context():
+            # Generate code only if no errors
+            if not self.errors:
+                # Generate while loop code
+                self.codegen.generate_while_loop(
+                    condition_func=partial(self._visit_condition, cond_expr, 'while'),
+                    body_func=partial(self.visit, block),
+                    ctx=ctx
+                )
+            else:
+                # Still perform semantic analysis (una condición true/false literal ya es boolean)
+                if not self.is_bool_literal(cond_expr):
+                    self._visit_condition(cond_expr, 'while')
+                self.visit(block)
 
         return None
     
     def visitDoWhileStatement(self, ctx):
-        condition_type = self.visit(ctx.expression())
-        if condition_type != BOOL_TYPE and condition_type != ERROR_TYPE:
-            self.add_error(ctx.expression(), f"Condición de 'do-while' debe ser boolean, encontrado {condition_type.name}")
+        cond_expr = ctx.expression()
+        block = ctx.block()
+
+        if not (self.errors and self.is_bool_literal(cond_expr)):
+            self._visit_condition(cond_expr, 'do-while')
         
         # Enter loop context
-        prev_in_loop = self.in_loop
-        self.in_loop = True
-        self.loop_depth += 1
-        
-        self.visit(ctx.block())
-        
-        # Exit loop context
-        self.loop_depth -= 1
-        self.in_loop = prev_in_loop or self.loop_depth > 0
+        with self._loop_context():
+            self.visit(block)
         
         return None
     
     def visitForStatement(self, ctx):
+        var_decl = ctx.variableDeclaration()
+        assignment = ctx.assignment()
+        cond_expr = ctx.expression(0)
+        update_expr = ctx.expression(1)
+        block = ctx.block()
+
         # Create new scope for for loop
         self.symbol_table.enter_scope("for")
 
         # Enter loop context
-        prev_in_loop = self.in_loop
-        self.in_loop = True
-        self.loop_depth += 1
-
-        # Generate code only if no errors
-        if not self.errors:
-            def init_func():
-                if ctx.variableDeclaration():
-                    self.visit(ctx.variableDeclaration())
-                elif ctx.assignment():
-                    self.visit(ctx.assignment())
-
-            def condition_func():
-                if ctx.expression(0):  # condition expression
-                    condition_type = self.visit(ctx.expression(0))
-                    if condition_type != BOOL_TYPE and condition_type != ERROR_TYPE:
-                        self.add_error(ctx.expression(0), f"Condición de 'for' debe ser boolean, encontrado {condition_type.name}")
-                    return self.codegen.current_temp
-                return None
-
-            def update_func():
-                if ctx.expression(1):  # increment expression
-                    self.visit(ctx.expression(1))
-
-            def body_func():
-                self.visit(ctx.block())
-
-            # Generate for loop code
-            self.codegen.generate_for_loop(
-                init_func=init_func if (ctx.variableDeclaration() or ctx.assignment()) else None,
-                condition_func=condition_func if ctx.expression(0) else None,
-                update_func=update_func if ctx.expression(1) else None,
-                body_func=body_func,
-                ctx=ctx
-            )
-        else:
-            # Still perform semantic analysis
-            if ctx.variableDeclaration():
-                self.visit(ctx.variableDeclaration())
-            elif ctx.assignment():
-                self.visit(ctx.assignment())
-
-            if ctx.expression(0):  # condition expression
-                condition_type = self.visit(ctx.expression(0))
-                if condition_type != BOOL_TYPE and condition_type != ERROR_TYPE:
-                    self.add_error(ctx.expression(0), f"Condición de 'for' debe ser boolean, encontrado {condition_type.name}")
+        with self._loop_context():
+            # Generate code only if no errors
+            if not self.errors:
+                visit = self.visit
+                init_ctx = var_decl or assignment
+
+                # Generate for loop code (cada parte opcional solo se pasa si existe)
+                self.codegen.generate_for_loop(
+                    init_func=partial(visit, init_ctx) if init_ctx else None,
+                    condition_func=partial(self._visit_condition, cond_expr, 'for') if cond_expr else None,
+                    update_func=partial(visit, update_expr) if update_expr else None,
+                    body_func=partial(visit, block),
+                    ctx=ctx
+                )
+            else:
+                # Still perform semantic analysis
+                if var_decl:
+                    self.visit(var_decl)
+                elif assignment:
+                    self.visit(assignment)
 
-            if ctx.expression(1):  # increment expression
-                self.visit(ctx.expression(1))
+                # condition expression (una condición true/false literal ya es boolean)
+                if cond_expr and not self.is_bool_literal(cond_expr):
+                    self._visit_condition(cond_expr, 'for')
 
-            self.visit(ctx.block())
+                if update_expr:  # increment expression
+                    self.visit(update_expr)
 
-        # Exit loop context
-        self.loop_depth -= 1
-        self.in_loop = prev_in_loop or self.loop_depth > 0
+                self.visit(block)
 
         # Exit for scope
         self.symbol_table.exit_scope()
@@ -1332,43 +1383,40 @@ class SemanticVisitor(CompiscriptVisitor):
         return None
     
     def visitForeachStatement(self, ctx):
+        symbol_table = self.symbol_table
+        iter_expr = ctx.expression()
+        iterator_ident = ctx.Identifier()
+        block = ctx.block()
+
         # Enter loop context
-        prev_in_loop = self.in_loop
-        self.in_loop = True
-        self.loop_depth += 1
-        
-        # Create new scope for foreach
-        self.symbol_table.enter_scope("foreach")
-        
-        # Visit the iterable expression
-        iterable_type = self.visit(ctx.expression())
-        
-        # Check if it's an array type
-        if isinstance(iterable_type, ArrayType):
-            # Create iterator variable
-            iterator_name = ctx.Identifier().getText()
-            iterator_symbol = VariableSymbol(
-                name=iterator_name,
-                type_=iterable_type.element_type,
-                scope_id=self.symbol_table.scopes[-1].scope_id,
-                is_const=False
-            )
+        with self._loop_context():
+            # Create new scope for foreach
+            symbol_table.enter_scope("foreach")
+        
+            # Visit the iterable expression
+            iterable_type = self.visit(iter_expr)
+        
+            # Check if it's an array type
+            if type(iterable_type) is ArrayType:
+                # Create iterator variable
+                iterator_name = iterator_ident.getText()
+                iterator_symbol = VariableSymbol(
+                    name=iterator_name,
+                    type_=iterable_type.element_type,
+                    scope_id=symbol_table.current_scope_id,
+                    is_const=False
+                )
             
-            try:
-                self.symbol_table.add_symbol(iterator_symbol)
-            except Exception as e:
-                self.add_error(ctx, str(e))
-        elif iterable_type != ERROR_TYPE:
-            self.add_error(ctx.expression(), f"foreach requiere un array, encontrado {iterable_type.name}")
-        
-        self.visit(ctx.block())
+                err = symbol_table.try_add_symbol(iterator_symbol)
+                if err:
+                    self.add_error(ctx, err)
+            elif iterable_type is not ERROR_TYPE:
+                self.add_error(iter_expr, f"foreach requiere un array, encontrado {iterable_type.name}")
         
-        # Exit foreach scope
-        self.symbol_table.exit_scope()
+            self.visit(block)
         
-        # Exit loop context
-        self.loop_depth -= 1
-        self.in_loop = prev_in_loop or self.loop_depth > 0
+            # Exit foreach scope
+            symbol_table.exit_scope()
         
         return None
     
@@ -1377,11 +1425,12 @@ class SemanticVisitor(CompiscriptVisitor):
         # Verificar código muerto antes del break
         self.check_unreachable_code(ctx, "statement break")
 
-        if not self.in_loop:
+        in_loop = self.loop_depth > 0
+        if not in_loop:
             self.add_error(ctx, "break solo puede usarse dentro de un bucle")
 
         # Generate code only if no errors and we're in a loop
-        if not self.errors and self.in_loop:
+        if not self.errors and in_loop:
             self.codegen.generate_break(ctx)
 
         # Marcar que cualquier código después de este break es inalcanzable
@@ -1392,11 +1441,12 @@ class SemanticVisitor(CompiscriptVisitor):
         # Verificar código muerto antes del continue
         self.check_unreachable_code(ctx, "statement continue")
 
-        if not self.in_loop:
+        in_loop = self.loop_depth > 0
+        if not in_loop:
             self.add_error(ctx, "continue solo puede usarse dentro de un bucle")
 
         # Generate code only if no errors and we're in a loop
-        if not self.errors and self.in_loop:
+        if not self.errors and in_loop:
             self.codegen.generate_continue(ctx)
 
         # Marcar que cualquier código después de este continue es inalcanzable
@@ -1411,7 +1461,11 @@ class SemanticVisitor(CompiscriptVisitor):
 
     def _class_type(self, class_name: str) -> Type:
     #Crea un Type para instancias de clase (comparación por nombre).
-        return Type(class_name)
+        # Como solo depende del nombre, se reutiliza el mismo objeto para cada clase
+        t = self._class_types.get(class_name)
+        if t is None:
+            t = self._class_types[class_name] = Type(class_name)
+        return t
 
     def _lookup_class(self, name: str):
         sym = self.symbol_table.lookup(name)
@@ -1432,191 +1486,139 @@ class SemanticVisitor(CompiscriptVisitor):
         return self._class_type(self.current_class.name)
 
 
+    def _visit_method_declaration(self, cls_sym, func_ctx):
+        """Registra y visita un método de cls_sym; el constructor solo cambia las validaciones"""
+        symbol_table = self.symbol_table
+        func_name = func_ctx.Identifier().getText()
+        is_constructor = func_name == "constructor"
+        type_ctx = func_ctx.type_()
+
+        if is_constructor:
+            if type_ctx:
+                self.add_error(func_ctx, "El constructor no debe declarar tipo de retorno")
+            return_type = VOID_TYPE
+        else:
+            return_type = self.get_type_from_ctx(type_ctx) if type_ctx else VOID_TYPE
+            if return_type is VOID_TYPE and type_ctx:
+                self.add_error(func_ctx, "Uso explícito de 'void' no permitido en funciones")
+                return None
+
+        func_symbol = FunctionSymbol(func_name, return_type, symbol_table.current_scope_id)
+        cls_sym.add_method(func_symbol)
+        err = symbol_table.try_add_symbol(func_symbol)
+        if err:
+            self.add_error(func_ctx, err)
+            # El constructor se sigue analizando aunque el nombre choque
+            if not is_constructor:
+                return None
+
+        symbol_table.enter_scope("function")
+        self.current_function = func_symbol
+
+        # En la misma pasada se arma la lista (nombre, tipo) para el codegen
+        params_for_codegen = []
+        params_ctx = func_ctx.parameters()
+        if params_ctx:
+            param_scope_id = symbol_table.current_scope_id
+            get_type = self.get_type_from_ctx
+            for p in params_ctx.parameter():
+                p_name = p.Identifier().getText()
+                p_type = get_type(p.type_()) or VOID_TYPE
+                p_sym = VariableSymbol(p_name, p_type, scope_id=param_scope_id, is_const=False)
+                func_symbol.add_parameter(p_sym)
+                params_for_codegen.append((p_name, p_type))
+                err = symbol_table.try_add_symbol(p_sym)
+                if err:
+                    self.add_error(p, err)
+
+        block = func_ctx.block()
+        if not self.errors:
+
+            self.codegen.generate_method_declaration(
+                class_name=cls_sym.name,
+                method_name=func_name,
+                parameters=params_for_codegen,
+                return_type=return_type,
+                body_func=partial(self.visit, block),
+                ctx=func_ctx
+            )
+        else:
+            self.visit(block)
+
+        if is_constructor:
+            for ret_type in func_symbol.bad_returns:
+                self.add_error(func_ctx, "El constructor no debe retornar un valor")
+        elif return_type is not VOID_TYPE:
+            if not func_symbol.has_return:
+                self.add_error(func_ctx, f"Función '{func_name}' debe retornar un valor")
+            else:
+                for ret_type in func_symbol.bad_returns:
+                    self.add_error(func_ctx, f"Tipo de retorno inconsistente en método '{func_name}'. Esperado: {return_type.name}, encontrado: {ret_type.name}")
+        else:
+            for ret_type in func_symbol.bad_returns:
+                self.add_error(func_ctx, f"Método void '{func_name}' no debe retornar valor")
+
+        symbol_table.exit_scope()
+        self.current_function = None
+        return func_symbol
+
     def visitClassDeclaration(self, ctx: CompiscriptParser.ClassDeclarationContext):
-        class_name = ctx.Identifier(0).getText()
+        class_ident, parent_ident = ctx.Identifier(0), ctx.Identifier(1)
+        class_name = class_ident.getText()
+        symbol_table = self.symbol_table
+        codegen = self.codegen
         
         # Evitar redeclaración
-        if self.symbol_table.is_declared_in_current_scope(class_name):
+        if symbol_table.is_declared_in_current_scope(class_name):
             self.add_error(ctx, f"Clase '{class_name}' ya declarada en este ámbito")
             return None
         
         # Herencia (opcional)
         parent_cls = None
-        if ctx.Identifier(1):
-            parent_name = ctx.Identifier(1).getText()
+        if parent_ident:
+            parent_name = parent_ident.getText()
             parent_cls = self._lookup_class(parent_name)
             if not parent_cls:
                 self.add_error(ctx, f"Clase padre '{parent_name}' no declarada")
         
-        cls_sym = ClassSymbol(class_name, scope_id=self.symbol_table.scopes[-1].scope_id, parent_class=parent_cls)
+        cls_sym = ClassSymbol(class_name, scope_id=symbol_table.current_scope_id, parent_class=parent_cls)
         
         # Registrar clase
-        try:
-            self.symbol_table.add_symbol(cls_sym)
-        except Exception as e:
-            self.add_error(ctx, str(e))
+        err = symbol_table.try_add_symbol(cls_sym)
+        if err:
+            self.add_error(ctx, err)
             return None
         
         # Entrar ámbito de clase
-        self.symbol_table.enter_scope("class")
+        symbol_table.enter_scope("class")
         prev_cls = self.current_class
         self.current_class = cls_sym
         
+        # classMember tiene un único hijo: la declaración concreta
+        members = [member.getChild(0) for member in ctx.classMember()]
+        
         # fix: Procesar PRIMERO los atributos para construir el layout
-        for member in ctx.classMember():
-            if member.variableDeclaration():
-                self.visit(member.variableDeclaration())
-                var_name = member.variableDeclaration().Identifier().getText()
-                sym = self.symbol_table.lookup(var_name, current_scope_only=True)
-                if isinstance(sym, VariableSymbol):
-                    cls_sym.add_attribute(sym)
-            elif member.constantDeclaration():
-                self.visit(member.constantDeclaration())
-                const_name = member.constantDeclaration().Identifier().getText()
-                sym = self.symbol_table.lookup(const_name, current_scope_only=True)
-                if isinstance(sym, VariableSymbol):
+        for member in members:
+            # Las declaraciones devuelven el símbolo creado (None si hubo error)
+            visit_attribute = _ATTRIBUTE_VISITORS.get(type(member))
+            if visit_attribute is not None:
+                sym = visit_attribute(self, member)
+                if sym is not None:
                     cls_sym.add_attribute(sym)
         
         # CREAR EL LAYOUT AHORA (antes de procesar métodos)
         try:
-            self.codegen.define_class_layout(cls_sym)
+            codegen.define_class_layout(cls_sym)
         except Exception as e:
             self.add_error(ctx, f"Error al crear layout de clase '{class_name}': {str(e)}")
         
         # AHORA procesar los métodos (que ya pueden usar el layout)
-        for member in ctx.classMember():
-            if member.functionDeclaration():
-                func_ctx = member.functionDeclaration()
-                func_name = func_ctx.Identifier().getText()
-                
-                # === CONSTRUCTOR ===
-                if func_name == "constructor":
-                    # ... código del constructor (igual que antes) ...
-                    if func_ctx.type_():
-                        self.add_error(func_ctx, "El constructor no debe declarar tipo de retorno")
-                    
-                    current_scope_id = self.symbol_table.scopes[-1].scope_id
-                    func_symbol = FunctionSymbol("constructor", VOID_TYPE, current_scope_id)
-                    cls_sym.add_method(func_symbol)
-                    try:
-                        self.symbol_table.add_symbol(func_symbol)
-                    except Exception as e:
-                        self.add_error(func_ctx, str(e))
-                    
-                    self.symbol_table.enter_scope("function")
-                    self.current_function = func_symbol
-                    
-                    # Parámetros del constructor
-                    if func_ctx.parameters():
-                        for p in func_ctx.parameters().parameter():
-                            p_name = p.Identifier().getText()
-                            p_type = self.get_type_from_ctx(p.type_() if p.type_() else None) or VOID_TYPE
-                            p_sym = VariableSymbol(p_name, p_type, scope_id=self.symbol_table.scopes[-1].scope_id, is_const=False)
-                            func_symbol.add_parameter(p_sym)
-                            try:
-                                self.symbol_table.add_symbol(p_sym)
-                            except Exception as e:
-                                self.add_error(p, str(e))
-                    
-                    if not self.errors:
-                        params_for_codegen = []
-                        if func_ctx.parameters():
-                            for p in func_ctx.parameters().parameter():
-                                pn = p.Identifier().getText()
-                                pt = self.get_type_from_ctx(p.type_() if p.type_() else None)
-                                params_for_codegen.append((pn, pt or VOID_TYPE))
-                        
-                        def body_func():
-                            self.visit(func_ctx.block())
-                        
-                        self.codegen.generate_method_declaration(
-                            class_name=cls_sym.name,
-                            method_name="constructor",
-                            parameters=params_for_codegen,
-                            return_type=VOID_TYPE,
-                            body_func=body_func,
-                            ctx=func_ctx
-                        )
-                    else:
-                        self.visit(func_ctx.block())
-                    
-                    for ret_t in func_symbol.return_statements:
-                        if ret_t != VOID_TYPE and ret_t != ERROR_TYPE:
-                            self.add_error(func_ctx, "El constructor no debe retornar un valor")
-                    
-                    self.symbol_table.exit_scope()
-                    self.current_function = None
-                
-                # === MÉTODO NORMAL ===
-                else:
-                    # ... código de métodos normales (igual que antes) ...
-                    return_type = self.get_type_from_ctx(func_ctx.type_()) if func_ctx.type_() else VOID_TYPE
-                    if return_type == VOID_TYPE and func_ctx.type_():
-                        self.add_error(func_ctx, "Uso explícito de 'void' no permitido en funciones")
-                        continue
-                    
-                    current_scope_id = self.symbol_table.scopes[-1].scope_id
-                    func_symbol = FunctionSymbol(func_name, return_type, current_scope_id)
-                    cls_sym.add_method(func_symbol)
-                    try:
-                        self.symbol_table.add_symbol(func_symbol)
-                    except Exception as e:
-                        self.add_error(func_ctx, str(e))
-                        continue
-                    
-                    self.symbol_table.enter_scope("function")
-                    self.current_function = func_symbol
-                    
-                    if func_ctx.parameters():
-                        for p in func_ctx.parameters().parameter():
-                            pn = p.Identifier().getText()
-                            pt = self.get_type_from_ctx(p.type_() if p.type_() else None)
-                            p_sym = VariableSymbol(pn, pt or VOID_TYPE, scope_id=self.symbol_table.scopes[-1].scope_id, is_const=False)
-                            func_symbol.add_parameter(p_sym)
-                            try:
-                                self.symbol_table.add_symbol(p_sym)
-                            except Exception as e:
-                                self.add_error(p, str(e))
-                    
-                    if not self.errors:
-                        params_for_codegen = []
-                        if func_ctx.parameters():
-                            for p in func_ctx.parameters().parameter():
-                                pn = p.Identifier().getText()
-                                pt = self.get_type_from_ctx(p.type_() if p.type_() else None)
-                                params_for_codegen.append((pn, pt or VOID_TYPE))
-                        
-                        def body_func():
-                            self.visit(func_ctx.block())
-                        
-                        self.codegen.generate_method_declaration(
-                            class_name=cls_sym.name,
-                            method_name=func_name,
-                            parameters=params_for_codegen,
-                            return_type=return_type,
-                            body_func=body_func,
-                            ctx=func_ctx
-                        )
-                    else:
-                        self.visit(func_ctx.block())
-                    
-                    if return_type != VOID_TYPE:
-                        if not func_symbol.return_statements:
-                            self.add_error(func_ctx, f"Función '{func_name}' debe retornar un valor")
-                        else:
-                            for ret_type in func_symbol.return_statements:
-                                if ret_type != ERROR_TYPE and ret_type != return_type:
-                                    self.add_error(func_ctx, f"Tipo de retorno inconsistente en método '{func_name}'. Esperado: {return_type.name}, encontrado: {ret_type.name}")
-                    else:
-                        for ret_type in func_symbol.return_statements:
-                            if ret_type != VOID_TYPE and ret_type != ERROR_TYPE:
-                                self.add_error(func_ctx, f"Método void '{func_name}' no debe retornar valor")
-                    
-                    self.symbol_table.exit_scope()
-                    self.current_function = None
+        for member in members:
+            if type(member) is _METHOD_MEMBER_CONTEXT:
+                self._visit_method_declaration(cls_sym, member)
         
         # Salir de la clase
-        self.symbol_table.exit_scope()
+        symbol_table.exit_scope()
         self.current_class = prev_cls
         return None
 
@@ -1631,6 +1633,10 @@ class SemanticVisitor(CompiscriptVisitor):
         # busque atributos/métodos recorriendo herencia
         # permita llamadas a métodos (encadenadas)
         base = ctx.primaryAtom()
+        # Atributos usados en varias ramas, enlazados una sola vez
+        symbol_table = self.symbol_table
+        codegen = self.codegen
+        lookup_class = self._lookup_class
 
         current_type = None
         pending_func = None  # FunctionSymbol pendiente de invocar
@@ -1638,17 +1644,17 @@ class SemanticVisitor(CompiscriptVisitor):
         # -------- Base ----------
         if isinstance(base, CompiscriptParser.IdentifierExprContext):
             name = base.Identifier().getText()
-            sym = self.symbol_table.lookup(name)
+            sym = symbol_table.lookup(name)
             if isinstance(sym, VariableSymbol):
                 current_type = sym.type
                 # === CAMBIO CLAVE ===
                 # Si es arreglo, NO desreferenciamos; necesitamos la dirección base.
-                if isinstance(current_type, ArrayType):
-                    addr_tmp = self.codegen.generate_address_of_variable(name, base)
-                    self.codegen.current_temp = addr_tmp
+                if type(current_type) is ArrayType:
+                    addr_tmp = codegen.generate_address_of_variable(name, base)
+                    codegen.current_temp = addr_tmp
                 else:
-                    tmp = self.codegen.generate_load_variable(name, base)
-                    self.codegen.current_temp = tmp
+                    tmp = codegen.generate_load_variable(name, base)
+                    codegen.current_temp = tmp
             elif isinstance(sym, FunctionSymbol):
                 pending_func = sym
             elif isinstance(sym, ClassSymbol):
@@ -1660,45 +1666,30 @@ class SemanticVisitor(CompiscriptVisitor):
 
         elif isinstance(base, CompiscriptParser.NewExprContext):
             class_name = base.Identifier().getText()
-            cls = self._lookup_class(class_name)
+            cls = lookup_class(class_name)
             if not cls:
                 self.add_error(base, f"Clase '{class_name}' no declarada")
                 return ERROR_TYPE
 
-            # Tipos de argumentos reales
-            arg_types = []
-            if base.arguments():
-                for e in base.arguments().expression():
-                    arg_types.append(self.visit(e))
+            # Tipos y temporales de los argumentos reales (una sola visita)
+            arg_types, arg_temps = self._visit_arguments(base.arguments())
 
             # Verificación de constructor
-            ctor = cls.methods.get("constructor")
+            ctor = cls.constructor
             if ctor:
-                if len(arg_types) != len(ctor.parameters):
-                    self.add_error(base, f"Constructor de '{class_name}' espera {len(ctor.parameters)} argumentos, recibió {len(arg_types)}")
-                else:
-                    for i, (p, a) in enumerate(zip(ctor.parameters, arg_types), start=1):
-                        if a != ERROR_TYPE and not a.can_assign_to(p.type):
-                            self.add_error(base, f"Argumento {i} del constructor de '{class_name}': esperado {p.type.name}, encontrado {a.name}")
+                self._check_arguments(base, class_name, ctor.parameters, arg_types,
+                                      "Constructor de '%s' espera %d argumentos, recibió %d",
+                                      "Argumento %d del constructor de '%s': esperado %s, encontrado %s")
             elif len(arg_types) != 0:
-                self.add_error(base, f"Clase '{class_name}' no define constructor; se esperaban 0 argumentos")
+                self.add_error(base, "Clase '%s' no define constructor; se esperaban 0 argumentos", class_name)
 
             # Instanciación y constructor
-            # Recolectar temporales de argumentos
-            arg_types = []
-            arg_temps = []
-            if base.arguments():
-                for e in base.arguments().expression():
-                    t = self.visit(e)
-                    arg_types.append(t)
-                    arg_temps.append(self.codegen.current_temp)
-
             # Instanciar objeto en heap
-            obj_temp = self.codegen.instantiate_object(class_name)
+            obj_temp = codegen.instantiate_object(class_name)
 
             # Si hay constructor válido y no se han levantado errores, invocarlo
             if ctor and not self.errors:
-                self.codegen.generate_method_call(
+                codegen.generate_method_call(
                     this_temp=obj_temp,
                     class_name=class_name,
                     method_name="constructor",
@@ -1707,7 +1698,7 @@ class SemanticVisitor(CompiscriptVisitor):
                 )
 
             # Devolver el tipo de la clase; dejar el 'this' en current_temp
-            self.codegen.current_temp = obj_temp
+            codegen.current_temp = obj_temp
             current_type = self._class_type(class_name)
 
         elif isinstance(base, CompiscriptParser.ThisExprContext):
@@ -1716,187 +1707,212 @@ class SemanticVisitor(CompiscriptVisitor):
                 return ERROR_TYPE
             current_type = self._class_type(self.current_class.name)
             # CRITICAL FIX: Generate code to load the this pointer!
-            tmp = self.codegen.load_this_pointer(base)
-            self.codegen.current_temp = tmp
+            tmp = codegen.load_this_pointer(base)
+            codegen.current_temp = tmp
 
         else:
             return self.visitChildren(ctx)
 
         # -------- Sufijos ----------
-        suffixes = list(ctx.suffixOp())
+        # Cada tipo de sufijo tiene su manejador (ver _SUFFIX_HANDLERS al final del módulo)
+        # suffixOp() ya devuelve una lista nueva: no hace falta copiarla
+        suffixes = ctx.suffixOp()
+        n = len(suffixes)
+        # Nombre de función suelto (sin sufijos): se reporta sobre la base y no se entra al bucle
+        if pending_func is not None and not n:
+            self.add_error(base, "Se esperaba invocar a la función '%s'", pending_func.name)
+            return ERROR_TYPE
         i = 0
-        while i < len(suffixes):
+        while i < n:
             s = suffixes[i]
-
-            # Llamada: (...)
-            if isinstance(s, CompiscriptParser.CallExprContext):
-                arg_types = []
-                arg_temps = []
-                if s.arguments():
-                    for e in s.arguments().expression():
-                        arg_type = self.visit(e)
-                        arg_types.append(arg_type)
-                        arg_temps.append(self.codegen.current_temp)
-
-                if pending_func:
-                    if len(arg_types) != len(pending_func.parameters):
-                        self.add_error(s, f"Función '{pending_func.name}' espera {len(pending_func.parameters)} argumentos, recibió {len(arg_types)}")
-                    else:
-                        for j, (p, a) in enumerate(zip(pending_func.parameters, arg_types), start=1):
-                            if a != ERROR_TYPE and not a.can_assign_to(p.type):
-                                self.add_error(s, f"Argumento {j} de '{pending_func.name}': esperado {p.type.name}, encontrado {a.name}")
-
-                    # CRITICAL FIX: Generate the function call TAC code!
-                    if not self.errors:
-                        result_temp = self.codegen.generate_function_call(pending_func.name, arg_temps, s)
-                        self.codegen.current_temp = result_temp
-
-                    current_type = pending_func.return_type
-                    pending_func = None
-                else:
-                    self.add_error(s, "Intento de invocar una expresión que no es función")
-                    current_type = ERROR_TYPE
-
-            # Indexación: [expr]
-            elif isinstance(s, CompiscriptParser.IndexExprContext):
-                if not isinstance(current_type, ArrayType):
-                    self.add_error(s, "Indexación sobre expresión que no es un arreglo")
-                    current_type = ERROR_TYPE
-                    pending_func = None
-                else:
-                    # Guardar base antes de visitar el índice (la visita cambia current_temp)
-                    base_addr_tmp = self.codegen.current_temp
-                    idx_t = self.visit(s.expression())
-                    idx_tmp = self.codegen.current_temp
-                    if idx_t != ERROR_TYPE and idx_t != INT_TYPE:
-                        self.add_error(s.expression(), f"El índice de un arreglo debe ser integer, encontrado {idx_t.name}")
-                    else:
-                        # Generar acceso: result = *(base + idx*elem_size)
-                        elem_size = self.codegen.get_type_size(current_type.element_type)
-                        self.codegen.generate_indexed_load(base_addr_tmp, idx_tmp, elem_size, s)
-                    current_type = current_type.element_type
-                pending_func = None
-
-
-            # Acceso a propiedad: .ident  (atributo o método, con herencia)
-            elif isinstance(s, CompiscriptParser.PropertyAccessExprContext):
-                member = s.Identifier().getText()
-                
-                # NUEVO: Si la base es 'this', recargar desde FP[0]
-                if isinstance(base, CompiscriptParser.ThisExprContext):
-                    obj_temp_for_method = self.codegen.load_this_pointer(s)
-                else:
-                    # Usar el temporal actual (ya cargado)
-                    obj_temp_for_method = self.codegen.current_temp
-                
-                # VALIDACIÓN
-                if not obj_temp_for_method or obj_temp_for_method == 'None':
-                    self.add_error(s, f"Acceso a propiedad '{member}' sobre valor inválido")
-                    current_type = ERROR_TYPE
-                    pending_func = None
-                    i += 1
-                    continue
-                
-                cls = self._lookup_class(current_type.name) if current_type else None
-                if not cls:
-                    self.add_error(s, f"No se puede acceder a miembro '{member}' de '{current_type.name if current_type else '?'}'")
-                    current_type = ERROR_TYPE
-                    pending_func = None
-                else:
-                    found = self.symbol_table.lookup_in_class(cls.name, member)
-                    
-                    if isinstance(found, VariableSymbol):
-                        # CAMBIO: Pasar obj_temp_for_method (que es 'this' correcto)
-                        load_temp = self.codegen.generate_property_load(
-                            base_temp=obj_temp_for_method,
-                            class_name=cls.name,
-                            member_name=member,
-                            ctx=s
-                        )
-                        current_type = found.type
-                        pending_func = None
-                    
-                    elif isinstance(found, FunctionSymbol):
-                        # Llamada a método...
-                        if i + 1 < len(suffixes) and isinstance(suffixes[i + 1], CompiscriptParser.CallExprContext):
-                            call = suffixes[i + 1]
-                            args_types = []
-                            args_temps = []
-                            if call.arguments():
-                                for e in call.arguments().expression():
-                                    t = self.visit(e)
-                                    args_types.append(t)
-                                    args_temps.append(self.codegen.current_temp)
-                            
-                            # Validaciones...
-                            if len(args_types) != len(found.parameters):
-                                self.add_error(call, f"Método '{member}' espera {len(found.parameters)} argumentos, recibió {len(args_types)}")
-                            
-                            if not self.errors:
-                                # CAMBIO: Pasar obj_temp_for_method (this correcto)
-                                result_temp = self.codegen.generate_method_call(
-                                    this_temp=obj_temp_for_method,
-                                    class_name=cls.name,
-                                    method_name=member,
-                                    arguments=args_temps,
-                                    ctx=call
-                                )
-                                self.codegen.current_temp = result_temp
-                            
-                            current_type = found.return_type
-                            i += 1
-                            pending_func = None
-                        else:
-                            self.add_error(s, f"Se esperaba invocar al método '{member}'")
-                            current_type = ERROR_TYPE
-                            pending_func = None
-                    else:
-                        self.add_error(s, f"Miembro '{member}' no existe en clase '{cls.name}'")
-                        current_type = ERROR_TYPE
-                        pending_func = None
-
+            handler = _SUFFIX_HANDLERS.get(type(s))
+            if handler is not None:
+                current_type, pending_func, i = handler(self, s, base, current_type, pending_func, suffixes, i)
             i += 1
 
         # Si queda una función pendiente sin invocar en la cola: error
         if pending_func:
-            self.add_error(ctx, f"Se esperaba invocar a la función '{pending_func.name}'")
+            self.add_error(ctx, "Se esperaba invocar a la función '%s'", pending_func.name)
             return ERROR_TYPE
 
         return current_type if current_type else ERROR_TYPE
 
+    def _check_arguments(self, ctx, callee, params, arg_types, arity_msg, arg_msg=None):
+        """Valida cantidad y tipos de argumentos contra los parámetros.
+        arity_msg recibe (callee, esperados, recibidos); arg_msg (posición, callee,
+        esperado, encontrado) y si es None no se validan tipos. Devuelve False si la aridad falla."""
+        n_params = len(params)
+        if len(arg_types) != n_params:
+            self.add_error(ctx, arity_msg, callee, n_params, len(arg_types))
+            return False
+        if arg_msg is not None:
+            for i in range(n_params):
+                a = arg_types[i]
+                if a is not ERROR_TYPE and not a.can_assign_to(params[i].type):
+                    self.add_error(ctx, arg_msg, i + 1, callee, params[i].type.name, a.name)
+        return True
+
+    def _visit_arguments(self, args_ctx):
+        """Visita los argumentos de una llamada; devuelve (tipos, temporales)"""
+        if not args_ctx:
+            return [], []
+        visit = self.visit
+        codegen = self.codegen
+        # Cada par se arma después de visitar, así que toma el temporal de ese argumento
+        visited = [(visit(e), codegen.current_temp) for e in args_ctx.expression()]
+        return [t for t, _ in visited], [tmp for _, tmp in visited]
+
+    # Manejadores de sufijos de visitLeftHandSide.
+    # Reciben el estado del recorrido y devuelven (current_type, pending_func, i);
+    # `i` avanza de más cuando el sufijo consume también el siguiente (método + llamada).
+
+    # Llamada: (...)
+    def _visit_call_suffix(self, s, base, current_type, pending_func, suffixes, i):
+        codegen = self.codegen
+        args_ctx = s.arguments()
+
+        if pending_func:
+            arg_types, arg_temps = self._visit_arguments(args_ctx)
+            self._check_arguments(s, pending_func.name, pending_func.parameters, arg_types,
+                                  "Función '%s' espera %d argumentos, recibió %d",
+                                  "Argumento %d de '%s': esperado %s, encontrado %s")
+
+            # CRITICAL FIX: Generate the function call TAC code!
+            if not self.errors:
+                result_temp = codegen.generate_function_call(pending_func.name, arg_temps, s)
+                codegen.current_temp = result_temp
+
+            return pending_func.return_type, None, i
+
+        # Sin función que invocar no se usan los temporales, pero los argumentos
+        # se siguen visitando para reportar sus propios errores
+        if args_ctx:
+            visit = self.visit
+            for e in args_ctx.expression():
+                visit(e)
+        self.add_error(s, "Intento de invocar una expresión que no es función")
+        return ERROR_TYPE, pending_func, i
+
+    # Indexación: [expr]
+    def _visit_index_suffix(self, s, base, current_type, pending_func, suffixes, i):
+        if type(current_type) is not ArrayType:
+            self.add_error(s, "Indexación sobre expresión que no es un arreglo")
+            return ERROR_TYPE, None, i
+
+        codegen = self.codegen
+        # Guardar base antes de visitar el índice (la visita cambia current_temp)
+        base_addr_tmp = codegen.current_temp
+        idx_expr = s.expression()
+        idx_t = self.visit(idx_expr)
+        idx_tmp = codegen.current_temp
+        if idx_t is not ERROR_TYPE and idx_t is not INT_TYPE:
+            self.add_error(idx_expr, f"El índice de un arreglo debe ser integer, encontrado {idx_t.name}")
+        else:
+            # Generar acceso: result = *(base + idx*elem_size)
+            elem_size = codegen.get_type_size(current_type.element_type)
+            codegen.generate_indexed_load(base_addr_tmp, idx_tmp, elem_size, s)
+        return current_type.element_type, None, i
+
+    # Acceso a propiedad: .ident  (atributo o método, con herencia)
+    def _visit_property_suffix(self, s, base, current_type, pending_func, suffixes, i):
+        codegen = self.codegen
+        member = s.Identifier().getText()
+
+        # NUEVO: Si la base es 'this', recargar desde FP[0]
+        if isinstance(base, CompiscriptParser.ThisExprContext):
+            obj_temp_for_method = codegen.load_this_pointer(s)
+        else:
+            # Usar el temporal actual (ya cargado)
+            obj_temp_for_method = codegen.current_temp
+
+        # VALIDACIÓN
+        if not obj_temp_for_method or obj_temp_for_method == 'None':
+            self.add_error(s, f"Acceso a propiedad '{member}' sobre valor inválido")
+            return ERROR_TYPE, None, i
+
+        cls = self._lookup_class(current_type.name) if current_type else None
+        if not cls:
+            self.add_error(s, f"No se puede acceder a miembro '{member}' de '{current_type.name if current_type else '?'}'")
+            return ERROR_TYPE, None, i
+
+        # cls ya está resuelta: consultar su tabla de miembros aplanada sin volver a buscarla por nombre
+        found = cls.members.get(member)
+
+        if isinstance(found, VariableSymbol):
+            # CAMBIO: Pasar obj_temp_for_method (que es 'this' correcto)
+            codegen.generate_property_load(
+                base_temp=obj_temp_for_method,
+                class_name=cls.name,
+                member_name=member,
+                ctx=s
+            )
+            return found.type, None, i
+
+        if isinstance(found, FunctionSymbol):
+            # Llamada a método...
+            if i + 1 < len(suffixes) and type(suffixes[i + 1]) is CompiscriptParser.CallExprContext:
+                call = suffixes[i + 1]
+                args_types, args_temps = self._visit_arguments(call.arguments())
+
+                # Validaciones... (los métodos solo validan la cantidad de argumentos)
+                self._check_arguments(call, member, found.parameters, args_types,
+                                      "Método '%s' espera %d argumentos, recibió %d")
+
+                if not self.errors:
+                    # CAMBIO: Pasar obj_temp_for_method (this correcto)
+                    result_temp = codegen.generate_method_call(
+                        this_temp=obj_temp_for_method,
+                        class_name=cls.name,
+                        method_name=member,
+                        arguments=args_temps,
+                        ctx=call
+                    )
+                    codegen.current_temp = result_temp
+
+                return found.return_type, None, i + 1
+
+            self.add_error(s, "Se esperaba invocar al método '%s'", member)
+            return ERROR_TYPE, None, i
+
+        self.add_error(s, f"Miembro '{member}' no existe en clase '{cls.name}'")
+        return ERROR_TYPE, None, i
+
 
     def visitSwitchStatement(self, ctx):
         """Visit switch statement"""
+        codegen = self.codegen
+        switch_expr = ctx.expression()
+        case_ctxs = ctx.switchCase()
+        default_case = ctx.defaultCase()
+
         # Visit the switch expression
-        switch_expr_type = self.visit(ctx.expression())
+        switch_expr_type = self.visit(switch_expr)
         
-        if switch_expr_type == ERROR_TYPE:
+        if switch_expr_type is ERROR_TYPE:
             return None
         
         # Switch expression must be integer or boolean
-        if switch_expr_type not in [INT_TYPE, BOOL_TYPE]:
-            self.add_error(ctx.expression(), f"Switch expression must be integer or boolean, found {switch_expr_type.name}")
+        if switch_expr_type not in _SWITCH_TYPES:
+            self.add_error(switch_expr, f"Switch expression must be integer or boolean, found {switch_expr_type.name}")
             return None
         
         # Generate code only if no errors
         if not self.errors:
-            switch_value_temp = self.codegen.current_temp
+            switch_value_temp = codegen.current_temp
             
             # Visit all case statements
             cases = []
-            for case_ctx in ctx.switchCase():
+            for case_ctx in case_ctxs:
                 # Visit case expression
-                case_expr_type = self.visit(case_ctx.expression())
-                if case_expr_type != ERROR_TYPE and case_expr_type != switch_expr_type:
-                    self.add_error(case_ctx.expression(), f"Case expression type {case_expr_type.name} doesn't match switch type {switch_expr_type.name}")
-                case_value_temp = self.codegen.current_temp
+                case_expr = case_ctx.expression()
+                case_expr_type = self.visit(case_expr)
+                if case_expr_type is not ERROR_TYPE and case_expr_type != switch_expr_type:
+                    self.add_error(case_expr, f"Case expression type {case_expr_type.name} doesn't match switch type {switch_expr_type.name}")
+                case_value_temp = codegen.current_temp
                 cases.append((case_value_temp, case_ctx))
             
-            # Check for default case
-            default_case = ctx.defaultCase() if ctx.defaultCase() else None
-            
             # Generate switch code
-            self.codegen.generate_switch_statement(
+            codegen.generate_switch_statement(
                 switch_value_temp,
                 cases,
                 default_case,
@@ -1904,21 +1920,52 @@ class SemanticVisitor(CompiscriptVisitor):
             )
         else:
             # Still visit children for semantic analysis
-            for case_ctx in ctx.switchCase():
+            for case_ctx in case_ctxs:
                 self.visit(case_ctx.expression())
-                for stmt in case_ctx.statement():
-                    self.visit(stmt)
+                self.visit(case_ctx)
             
-            if ctx.defaultCase():
-                for stmt in ctx.defaultCase().statement():
-                    self.visit(stmt)
+            if default_case:
+                self.visit(default_case)
         
         return None
 
     def visitSwitchCase(self, ctx):
-        """Visit switch case - handled by visitSwitchStatement"""
-        pass
+        """Visit case body - the case expression is handled by visitSwitchStatement"""
+        return self._visit_case_statements(ctx)
 
     def visitDefaultCase(self, ctx):
-        """Visit default case - handled by visitSwitchStatement"""
-        pass
+        """Visit default case body"""
+        return self._visit_case_statements(ctx)
+
+    def _visit_case_statements(self, ctx):
+        # Cada case es un bloque básico aparte (sin fallthrough): un break/return
+        # en un case no vuelve código muerto al siguiente, igual que en visitBlock
+        old_unreachable = self.unreachable_code
+        self.unreachable_code = False
+        for stmt in ctx.statement():
+            self.visit(stmt)
+        self.unreachable_code = old_unreachable
+        return None
+
+
+# Tabla de despacho: clase de contexto -> SemanticVisitor.visitX, el mismo método
+# que elegiría accept() pero sin el hasattr/getattr por nodo.
+_DISPATCH = {
+    ctx_class: getattr(SemanticVisitor, 'visit' + name[:-len('Context')])
+    for name, ctx_class in vars(CompiscriptParser).items()
+    if isinstance(ctx_class, type) and issubclass(ctx_class, ParserRuleContext)
+    and 'accept' in ctx_class.__dict__
+}
+
+# Sufijos de leftHandSide: clase de contexto -> manejador
+_SUFFIX_HANDLERS = {
+    CompiscriptParser.CallExprContext: SemanticVisitor._visit_call_suffix,
+    CompiscriptParser.IndexExprContext: SemanticVisitor._visit_index_suffix,
+    CompiscriptParser.PropertyAccessExprContext: SemanticVisitor._visit_property_suffix,
+}
+
+# Atributos de clase: se llama directo al visitor, que devuelve el símbolo creado
+_ATTRIBUTE_VISITORS = {
+    CompiscriptParser.VariableDeclarationContext: SemanticVisitor.visitVariableDeclaration,
+    CompiscriptParser.ConstantDeclarationContext: SemanticVisitor.visitConstantDeclaration,
+}
@@ -1046,6 +1046,34 @@ class TestDeadCodeDetection(unittest.TestCase):
         else:
             print("\nAnálisis semántico completado sin errores")
     
+    def test_dead_code_scoped_to_switch_case(self):
+        """Test that a break in one case does not mark other cases or code after the switch as dead"""
+        code = '''
+        function pick(n: integer): integer {
+            let r: integer = 0;
+            while (r < 1) {
+                switch (n) {
+                    case 1:
+                        r = 1;
+                        break;
+                    case 2:
+                        r = 2;
+                        break;
+                        r = 3;  // Dead code
+                    default:
+                        r = 4;
+                }
+                r = r + 1;
+            }
+            return r;
+        }
+        '''
+
+        analyzer = self.analyze_code(code)
+        self.assertEqual(len(analyzer.errors), 0, f"Errores: {analyzer.errors}")
+        self.assertEqual(len(analyzer.warnings), 1, f"Advertencias: {analyzer.warnings}")
+        self.assertIn("Línea 12: Código muerto", analyzer.warnings[0])
+
     def test_reachable_code_in_branches(self):
         """Test that code in different branches is not marked as dead"""
         code = '''
@@ -1366,6 +1394,18 @@ class TestAssignmentAndTypeValidation(unittest.TestCase):
         analyzer = analyze_code(code)
         self.assertGreater(len(analyzer.errors), 0)
         self.assertTrue(any("debe ser inicializada" in error for error in analyzer.errors))
+
+    def test_const_with_invalid_initializer(self):
+        """Test that a failed initializer reports a single error and still declares the constant"""
+        code = '''
+        const k: integer = otherMissing;  // Error: otherMissing not declared
+        print(k);
+        '''
+
+        from main2 import analyze_code
+        analyzer = analyze_code(code)
+        self.assertEqual(len(analyzer.errors), 1, f"Errores: {analyzer.errors}")
+        self.assertIn("'otherMissing' no declarado", analyzer.errors[0])
     
     def test_type_inference_with_null(self):
         """Test type inference with null values"""
@@ -1446,6 +1486,30 @@ class TestArraySemantics(unittest.TestCase):
         self.assertIn('numbers', global_scope.symbols)
         self.assertIn('matrix', global_scope.symbols)
     
+    def test_array_literal_element_stores(self):
+        """Test that an array literal initializer stores each element in order"""
+        code = '''
+        let a: integer[] = [1,2,3];
+        '''
+
+        from main2 import analyze_code
+        analyzer = analyze_code(code)
+        self.assertEqual(len(analyzer.errors), 0, f"Errores: {analyzer.errors}")
+
+        quads = analyzer.codegen.quadruples
+        stores = [q for q in quads if q.op == '[]=']
+        self.assertEqual([q.arg1 for q in stores], ['1', '2', '3'])
+        # Cada elemento se guarda en la dirección calculada justo antes (base + i*4)
+        for i, store in enumerate(stores):
+            k = quads.index(store)
+            index_q, offset_q, address_q = quads[k - 3:k]
+            self.assertEqual((index_q.op, index_q.arg1), ('=', i))
+            self.assertEqual((offset_q.op, offset_q.arg1, offset_q.arg2), ('*', index_q.result, 4))
+            self.assertEqual((address_q.op, address_q.arg2), ('+', offset_q.result))
+            self.assertEqual(store.result, address_q.result)
+        # Ningún operando queda como la lista del literal
+        self.assertFalse(any(isinstance(x, (list, tuple)) for q in quads for x in (q.arg1, q.arg2, q.result)))
+
     def test_array_element_type_consistency(self):
         """Test that array elements must be of consistent type"""
         code = '''
@@ -1515,5 +1579,141 @@ class TestErrorPropagation(unittest.TestCase):
         self.assertGreater(len(analyzer.errors), 0)
         self.assertTrue(any("return fuera de función" in error for error in analyzer.errors))
 
+    def test_arguments_checked_on_invalid_call(self):
+        """Test that arguments of an invalid call are still analyzed"""
+        code = '''
+        class P {
+            let v: integer;
+        }
+        let a: P = new P();
+        a.nope(undefinedVar + 1);  // Error: no such member, and undefinedVar
+        '''
+
+        from main2 import analyze_code
+        analyzer = analyze_code(code)
+        self.assertTrue(any("Miembro 'nope' no existe" in error for error in analyzer.errors))
+        self.assertTrue(any("'undefinedVar' no declarado" in error for error in analyzer.errors))
+
+class TestClassResolution(unittest.TestCase):
+    """Tests for class name resolution across scopes"""
+
+    def test_class_shadowed_by_local_variable(self):
+        """Test that a local variable hides a class with the same name"""
+        code = '''
+        class A {
+            let x: integer;
+        }
+        function f(): integer {
+            let a = new A();
+            let A: integer = 3;
+            let b = new A();  // Error: A is now an integer
+            return 1;
+        }
+        '''
+
+        from main2 import analyze_code
+        analyzer = analyze_code(code)
+        self.assertEqual(len(analyzer.errors), 1, f"Errores: {analyzer.errors}")
+        self.assertIn("Clase 'A' no declarada", analyzer.errors[0])
+
+    def test_local_class_not_visible_outside_function(self):
+        """Test that a class declared in a function body is not visible afterwards"""
+        code = '''
+        function g(): integer {
+            class B {
+                let y: integer;
+            }
+            let b = new B();
+            return 1;
+        }
+        let d = new B();  // Error: B out of scope
+        '''
+
+        from main2 import analyze_code
+        analyzer = analyze_code(code)
+        self.assertEqual(len(analyzer.errors), 1, f"Errores: {analyzer.errors}")
+        self.assertIn("Clase 'B' no declarada", analyzer.errors[0])
+
+class TestObjectInstantiation(unittest.TestCase):
+    """Tests for code generated by new expressions"""
+
+    def test_constructor_arguments_emitted_once(self):
+        """Test that constructor arguments are evaluated once and pushed for the call"""
+        code = '''
+        class C {
+            let v: integer;
+            function constructor(a: integer) {
+                this.v = a;
+            }
+        }
+        let k: integer = 5;
+        let c: C = new C(k * 7);
+        '''
+
+        from main2 import analyze_code
+        analyzer = analyze_code(code)
+        self.assertEqual(len(analyzer.errors), 0, f"Errores: {analyzer.errors}")
+
+        quads = analyzer.codegen.quadruples
+        products = [q for q in quads if q.op == '*']
+        self.assertEqual(len(products), 1, [str(q) for q in quads])
+        pushes = [q for q in quads if q.op == 'push']
+        self.assertEqual(pushes[0].arg1, products[0].result)
+
+
+class TestSymbolTableLookup(unittest.TestCase):
+    """Tests for SymbolTable lookups with its name cache"""
+
+    def setUp(self):
+        from classes.symbol_table import SymbolTable
+        from classes.types import INT_TYPE, STRING_TYPE
+        self.table = SymbolTable()
+        self.INT_TYPE = INT_TYPE
+        self.STRING_TYPE = STRING_TYPE
+
+    def _var(self, name, type_):
+        from classes.symbols import VariableSymbol
+        return VariableSymbol(name, type_, self.table.current_scope_id)
+
+    def test_shadowing_after_cached_lookup(self):
+        """Test that an inner declaration hides a name already resolved (and cached) outside"""
+        outer = self._var('x', self.INT_TYPE)
+        self.table.add_symbol(outer)
+        self.assertIs(self.table.lookup('x'), outer)
+
+        self.table.enter_scope("block")
+        self.assertIs(self.table.lookup('x'), outer)
+        inner = self._var('x', self.STRING_TYPE)
+        self.table.add_symbol(inner)
+        self.assertIs(self.table.lookup('x'), inner)
+
+        self.table.exit_scope()
+        self.assertIs(self.table.lookup('x'), outer)
+
+    def test_lookup_after_exiting_declaring_scope(self):
+        """Test that a name declared in an exited scope is no longer visible"""
+        self.table.enter_scope("function")
+        local = self._var('y', self.INT_TYPE)
+        self.table.add_symbol(local)
+        self.assertIs(self.table.lookup('y'), local)
+
+        self.table.exit_scope()
+        self.assertIsNone(self.table.lookup('y'))
+
+    def test_failed_redeclaration_keeps_original(self):
+        """Test that a rejected try_add_symbol reports the error and keeps the first symbol"""
+        first = self._var('z', self.INT_TYPE)
+        self.assertIsNone(self.table.try_add_symbol(first))
+        self.assertIs(self.table.lookup('z'), first)
+
+        err = self.table.try_add_symbol(self._var('z', self.STRING_TYPE))
+        self.assertIsNotNone(err)
+        self.assertIn("'z' ya existe", err)
+        self.assertIs(self.table.lookup('z'), first)
+
+        with self.assertRaises(Exception):
+            self.table.add_symbol(self._var('z', self.STRING_TYPE))
+        self.assertIs(self.table.lookup('z'), first)
+
 if __name__ == '__main__':
     unittest.main()